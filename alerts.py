@@ -7,6 +7,8 @@ class AlertBot:
         self.token = token or config.TELEGRAM_BOT_TOKEN
         self.chat_id = chat_id or config.TELEGRAM_CHAT_ID
         self.base_url = f"https://api.telegram.org/bot{self.token}"
+        # Reused across messages so repeat alerts skip the TLS handshake
+        self.session = requests.Session()
 
     def send_message(self, text):
         """
@@ -24,7 +26,7 @@ class AlertBot:
         }
         
         try:
-            response = requests.post(url, json=payload)
+            response = self.session.post(url, json=payload, timeout=10)
             if response.status_code != 200:
                 logging.error(f"Failed to send Telegram alert: {response.text}")
         except Exception as e:
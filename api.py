@@ -172,11 +172,8 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
         # Calculate Global Balance from Wallets
         balance = wallets_df['available_balance'].sum() if not wallets_df.empty else 0.0
         
-        # Fetch ALL trades logic (Only needed for Charts/Metrics now, not for Capital Calc)
-        # We can fetch this later only if needed, or keep it if used for analytics
-        all_trades_df = pd.read_sql_query("""
-            SELECT * FROM trades ORDER BY entry_time DESC
-        """, conn)
+        # ALL trades (only needed for Charts/Metrics) are fetched further
+        # down, projected to the columns the analytics use
         conn.close()
         
         # Defaults
@@ -185,6 +182,8 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
         total_pnl = 0.0
         
         stocks_html = "<div class='alert alert-secondary'>No open positions.</div>"
+        # Per-strategy totals of open positions, filled in below
+        open_by_strategy = {}
         if not df.empty:
             # Fetch Real-Time Prices
             tickers = [f"{s}.NS" for s in df['symbol'].unique()]
@@ -202,7 +201,7 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
             # Calc PnL
             df['cmp'] = df['symbol'].apply(lambda x: live_prices.get(f"{x}.NS", 0.0))
             # Handle missing CMP (if market closed or yf fail, fallback to entry)
-            df['cmp'] = df.apply(lambda row: row['entry_price'] if row['cmp'] == 0 or pd.isna(row['cmp']) else row['cmp'], axis=1)
+            df['cmp'] = df['cmp'].where(df['cmp'].notna() & (df['cmp'] != 0), df['entry_price'])
             
             df['invested'] = df['entry_price'] * df['quantity']
             df['current_val'] = df['cmp'] * df['quantity']
@@ -219,6 +218,13 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
             current_value = df['current_val'].sum()
             total_pnl = current_value - total_invested
             
+            # One groupby for every strategy's open-position totals
+            open_by_strategy = df.groupby('strategy').agg(
+                invested=('invested', 'sum'),
+                current_val=('current_val', 'sum'),
+                positions=('symbol', 'size')
+            ).to_dict('index')
+            
             # Generate Tables
             cols = ['strategy', 'symbol', 'quantity', 'entry_display', 'cmp_display', 'pnl_display', 'tp', 'sl']
             rename_map = {'strategy': 'Strategy', 'symbol':'Symbol', 'quantity':'Qty', 'entry_display':'Entry', 'cmp_display':'CMP', 'pnl_display':'PnL', 'tp':'Target', 'sl':'Stop Loss'}
@@ -227,20 +233,15 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
 
         # Build Strategy Capital Dict (Real Data from DB)
         if not wallets_df.empty:
-            for _, row in wallets_df.iterrows():
-                strat = row['strategy']
-                cash = row['available_balance']
-                allocation = row['allocation'] or 100000.0 # Fallback
+            for row in wallets_df.itertuples(index=False):
+                strat = row.strategy
+                cash = row.available_balance
+                allocation = row.allocation or 100000.0 # Fallback
                 
                 # Get stats from Open Trades
-                s_invested = 0.0
-                s_pos_count = 0
-                
-                if not df.empty:
-                    strat_pos = df[df['strategy'] == strat]
-                    if not strat_pos.empty:
-                       s_invested = strat_pos['invested'].sum()
-                       s_pos_count = len(strat_pos)
+                s_open = open_by_strategy.get(strat, {})
+                s_invested = s_open.get('invested', 0.0)
+                s_pos_count = int(s_open.get('positions', 0))
                 
                 # Metrics
                 current_balance = cash + s_invested
@@ -267,6 +268,8 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
             open_df = pd.DataFrame()
             
             conn = sqlite3.connect('trades.db')
+            # strategy/status repeat a handful of values across every
+            # trade, so load them as categoricals for the analytics below
             all_trades_df = pd.read_sql_query("""
                 SELECT 
                     id,
@@ -285,7 +288,7 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
                     status
                 FROM trades 
                 ORDER BY entry_time DESC
-            """, conn)
+            """, conn, dtype={'strategy': 'category', 'status': 'category'})
             conn.close()
             
             if not all_trades_df.empty:
@@ -299,9 +302,7 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
                 # Risk = Entry - SL, Reward = TP - Entry (for BUY trades)
                 closed_df['risk'] = closed_df['entry_price'] - closed_df['sl']
                 closed_df['reward'] = closed_df['tp'] - closed_df['entry_price']
-                closed_df['rr_ratio'] = closed_df.apply(
-                    lambda row: row['reward'] / row['risk'] if row['risk'] > 0 else 0, axis=1
-                )
+                closed_df['rr_ratio'] = (closed_df['reward'] / closed_df['risk']).where(closed_df['risk'] > 0, 0)
                 closed_df['rr_display'] = closed_df['rr_ratio'].apply(
                     lambda x: f"1:{x:.1f}" if x > 0 else "N/A"
                 )
@@ -389,14 +390,9 @@ def view_portfolio(api_key: str = Depends(get_api_key)):
         for strat, cap_data in strategy_capital.items():
             s_cash = cap_data.get('available_cash', 0.0)
             
-            s_invested = 0.0
-            s_current_val = 0.0
-            
-            if not df.empty:
-                strat_pos = df[df['strategy'] == strat]
-                if not strat_pos.empty:
-                    s_invested = strat_pos['invested'].sum()
-                    s_current_val = strat_pos['current_val'].sum()
+            s_open = open_by_strategy.get(strat, {})
+            s_invested = s_open.get('invested', 0.0)
+            s_current_val = s_open.get('current_val', 0.0)
             
             s_pnl = s_current_val - s_invested
             
@@ -34,15 +34,21 @@ Version: 1.0.0
 import os
 import json
 import logging
+import threading
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 
 from dhanhq import dhanhq
 from dotenv import load_dotenv
-import yfinance as yf
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 
+import ohlcv_cache
 from strategies.vwap_breakout import VWAPStrategy
 
 # Configure logging
@@ -75,6 +81,10 @@ class Config:
     CAPITAL_PER_TRADE: float = 100000  # ₹1,00,000 per trade
     MAX_RISK_PER_TRADE: float = 0.02   # 2% risk per trade
     MAX_ORDERS_PER_DAY: int = 3        # Maximum orders per day
+    SCAN_WORKERS: int = 16             # Threads for the per-symbol scan
+    KEEPALIVE_INTERVAL: float = 25     # Seconds between Dhan keepalive pings
+    FETCH_TIMEOUT: float = 10          # Seconds per Yahoo Finance request
+    MAX_SIGNAL_AGE_DAYS: int = 1       # Ignore signals older than this
     DRY_RUN: bool = False              # Set False for live trading
     
     # Files
@@ -146,17 +156,34 @@ WATCHLIST: List[str] = [
 class TelegramNotifier:
     """Handles Telegram notifications for trading alerts."""
     
-    def __init__(self, bot_token: str, chat_id: str):
+    # Telegram rejects messages longer than this
+    MAX_MESSAGE_LENGTH: int = 4096
+    DIGEST_SEPARATOR: str = "\n\n---\n\n"
+    
+    def __init__(self, bot_token: str, chat_id: str, batch_mode: bool = False):
         """
         Initialize Telegram notifier.
         
         Args:
             bot_token: Telegram bot token
             chat_id: Target chat ID for messages
+            batch_mode: Queue order alerts until flush() instead of
+                sending each one immediately
         """
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.enabled = bool(bot_token and chat_id)
+        self.batch_mode = batch_mode
+        self.queue: List[str] = []
+        # Single worker so background messages arrive in the order sent
+        self._sender = ThreadPoolExecutor(max_workers=1)
+        
+        # Keep-alive session so only the first message pays for TLS setup
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=2, pool_maxsize=4,
+            max_retries=Retry(total=2, backoff_factor=0.2)
+        ))
     
     def send(self, message: str) -> bool:
         """
@@ -179,15 +206,74 @@ class TelegramNotifier:
                 "text": message,
                 "parse_mode": "HTML"
             }
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.session.post(url, json=payload, timeout=10)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Telegram error: {e}")
             return False
     
+    def send_background(self, message: str) -> Future:
+        """
+        Send a message on the background sender thread.
+        
+        The caller does not wait for the Telegram round trip. Call close()
+        before exiting to let pending messages go out.
+        
+        Args:
+            message: Message text (supports HTML formatting)
+            
+        Returns:
+            Future resolving to the result of send()
+        """
+        return self._sender.submit(self.send, message)
+    
+    def close(self) -> None:
+        """Wait for pending background messages, then close the session."""
+        self._sender.shutdown(wait=True)
+        self.session.close()
+    
+    def _dispatch(self, message: str) -> None:
+        """Send a message in the background, or queue it in batch mode."""
+        if self.batch_mode:
+            self.queue.append(message)
+        else:
+            self.send_background(message)
+    
+    def flush(self) -> bool:
+        """
+        Send all queued alerts as a single digest message.
+        
+        The digest is split into several messages only when it would
+        exceed Telegram's message size limit. Messages go through the
+        background sender, so they stay in order behind anything already
+        sent with send_background().
+        
+        Returns:
+            True if every digest message was sent successfully
+        """
+        if not self.queue:
+            return True
+        
+        queued, self.queue = self.queue, []
+        
+        digests: List[str] = []
+        current = ""
+        for message in queued:
+            candidate = f"{current}{self.DIGEST_SEPARATOR}{message}" if current else message
+            if current and len(candidate) > self.MAX_MESSAGE_LENGTH:
+                digests.append(current)
+                current = message
+            else:
+                current = candidate
+        digests.append(current)
+        
+        futures = [self.send_background(digest) for digest in digests]
+        return all(f.result() for f in futures)
+    
     def alert_order_placed(self, symbol: str, order_type: str, entry: float,
                            sl: float, tp: float, quantity: int, 
-                           order_id: str, dry_run: bool = False) -> None:
+                           order_id: str, dry_run: bool = False,
+                           timestamp: Optional[str] = None) -> None:
         """
         Send alert when an order is placed.
         
@@ -200,7 +286,15 @@ class TelegramNotifier:
             quantity: Number of shares
             order_id: Broker order ID
             dry_run: Whether this is a simulated order
+            timestamp: Preformatted HH:MM:SS time of the order (default: now)
         """
+        if not self.enabled:
+            logger.info("Alert suppressed for %s", symbol)
+            return
+        
+        if timestamp is None:
+            timestamp = datetime.now().strftime('%H:%M:%S')
+        
         emoji = "🟢" if order_type == "BUY" else "🔴"
         mode = "⚠️ DRY RUN - No real order placed" if dry_run else "✅ LIVE ORDER"
         
@@ -216,11 +310,11 @@ class TelegramNotifier:
 🎯 <b>Target:</b> ₹{tp:,.2f}
 
 🔖 <b>Order ID:</b> {order_id}
-⏰ <b>Time:</b> {datetime.now().strftime('%H:%M:%S')}
+⏰ <b>Time:</b> {timestamp}
 
 {mode}
 """
-        self.send(message)
+        self._dispatch(message)
     
     def alert_error(self, symbol: str, error: str) -> None:
         """
@@ -230,6 +324,10 @@ class TelegramNotifier:
             symbol: Stock symbol
             error: Error message
         """
+        if not self.enabled:
+            logger.info("Alert suppressed for %s", symbol)
+            return
+        
         message = f"""
 ❌ <b>ORDER FAILED</b>
 
@@ -237,7 +335,7 @@ class TelegramNotifier:
 ⚠️ <b>Error:</b> {error}
 ⏰ <b>Time:</b> {datetime.now().strftime('%H:%M:%S')}
 """
-        self.send(message)
+        self._dispatch(message)
 
 
 # =============================================================================
@@ -255,18 +353,61 @@ class OrderTracker:
             orders_file: Path to JSON file for persisting orders
         """
         self.orders_file = orders_file
+        self._cached_mtime: int = -1
+        self._cached: Optional[Dict[str, Any]] = None
+        self._today_symbols: Set[str] = set()
+    
+    def _index_today(self, orders_data: Dict[str, Any]) -> None:
+        """Rebuild the set of symbols already traded today."""
+        today = str(date.today())
+        self._today_symbols = {
+            o["symbol"] for o in orders_data["orders"] if o["date"] == today
+        }
+    
+    @staticmethod
+    def _copy(orders_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy orders data deep enough for record_order to mutate safely."""
+        return {**orders_data, "orders": list(orders_data["orders"])}
     
     def load(self) -> Dict[str, Any]:
-        """Load orders from file."""
-        if os.path.exists(self.orders_file):
-            with open(self.orders_file, 'r') as f:
-                return json.load(f)
-        return {"orders": [], "today": str(date.today()), "count": 0}
+        """
+        Load orders from file (re-parsed only when its mtime changes).
+        
+        Returns a copy, so changes reach the cache only through a
+        successful save().
+        """
+        try:
+            st = os.stat(self.orders_file)
+        except FileNotFoundError:
+            self._today_symbols = set()
+            return {"orders": [], "today": str(date.today()), "count": 0}
+        
+        if st.st_mtime_ns == self._cached_mtime and self._cached is not None:
+            return self._copy(self._cached)
+        
+        with open(self.orders_file, 'r') as f:
+            orders_data = json.load(f)
+        
+        self._cached_mtime = st.st_mtime_ns
+        self._cached = orders_data
+        self._index_today(orders_data)
+        return self._copy(orders_data)
     
     def save(self, orders_data: Dict[str, Any]) -> None:
         """Save orders to file."""
         with open(self.orders_file, 'w') as f:
             json.dump(orders_data, f, indent=2)
+        
+        self._cached_mtime = os.stat(self.orders_file).st_mtime_ns
+        self._cached = orders_data
+        self._index_today(orders_data)
+    
+    def orders_today(self) -> int:
+        """Return the number of orders recorded today."""
+        orders_data = self.load()
+        if orders_data.get("today") != str(date.today()):
+            return 0
+        return orders_data.get("count", 0)
     
     def can_place_order(self, symbol: str, max_per_day: int) -> Tuple[bool, str]:
         """
@@ -291,17 +432,14 @@ class OrderTracker:
             return False, "Daily order limit reached"
         
         # Check if already traded this symbol today
-        today_symbols = [
-            o["symbol"] for o in orders_data["orders"] 
-            if o["date"] == str(date.today())
-        ]
-        if symbol in today_symbols:
+        if symbol in self._today_symbols:
             return False, "Already traded this symbol today"
         
         return True, "OK"
     
     def record_order(self, symbol: str, order_type: str, entry: float,
-                     sl: float, tp: float, quantity: int, order_id: str) -> None:
+                     sl: float, tp: float, quantity: int, order_id: str,
+                     timestamp: Optional[str] = None) -> None:
         """
         Record a placed order.
         
@@ -313,9 +451,13 @@ class OrderTracker:
             tp: Target price
             quantity: Number of shares
             order_id: Broker order ID
+            timestamp: Preformatted HH:MM:SS time of the order (default: now)
         """
         orders_data = self.load()
         
+        if timestamp is None:
+            timestamp = datetime.now().strftime('%H:%M:%S')
+        
         orders_data["orders"].append({
             "symbol": symbol,
             "order_type": order_type,
@@ -325,7 +467,7 @@ class OrderTracker:
             "quantity": quantity,
             "order_id": order_id,
             "date": str(date.today()),
-            "time": datetime.now().strftime('%H:%M:%S')
+            "time": timestamp
         })
         orders_data["count"] = orders_data.get("count", 0) + 1
         
@@ -371,10 +513,50 @@ def calculate_quantity(entry_price: float, sl_price: float,
     return max(1, quantity)
 
 
+def calculate_quantities(entry_prices: np.ndarray, sl_prices: np.ndarray,
+                         capital: float, max_risk: float) -> np.ndarray:
+    """
+    Vectorized calculate_quantity over many signals at once.
+    
+    Args:
+        entry_prices: Entry price per share for each signal
+        sl_prices: Stop-loss price per share for each signal
+        capital: Total capital available per trade
+        max_risk: Maximum risk as decimal (e.g., 0.02 for 2%)
+        
+    Returns:
+        Integer array of share counts, element-wise identical to
+        calculate_quantity (0 where risk per share is not positive)
+    """
+    entry_prices = np.asarray(entry_prices, dtype=np.float64)
+    risk_per_share = np.abs(entry_prices - np.asarray(sl_prices, dtype=np.float64))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        qty_by_risk = np.floor(capital * max_risk / risk_per_share)
+        qty_by_capital = np.floor(capital / entry_prices)
+    
+    quantity = np.maximum(1, np.minimum(qty_by_risk, qty_by_capital))
+    return np.where(risk_per_share > 0, quantity, 0).astype(np.int64)
+
+
 # =============================================================================
 # ORDER EXECUTION
 # =============================================================================
 
+@dataclass
+class Order:
+    """A validated, sized order ready to send to the broker."""
+    __slots__ = ("symbol", "security_id", "action", "entry", "sl", "tp", "quantity")
+    
+    symbol: str
+    security_id: str
+    action: str       # BUY or SELL
+    entry: float
+    sl: float
+    tp: float
+    quantity: int
+
+
 class DhanOrderExecutor:
     """Handles order execution via Dhan API."""
     
@@ -382,6 +564,10 @@ class DhanOrderExecutor:
         """
         Initialize Dhan order executor.
         
+        The client is created on the first order, or up front by calling
+        connect() and start_keepalive() so live orders skip client and
+        connection setup.
+        
         Args:
             client_id: Dhan client ID
             access_token: Dhan API access token
@@ -389,6 +575,8 @@ class DhanOrderExecutor:
         self.client_id = client_id
         self.access_token = access_token
         self.dhan = None
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._keepalive_stop = threading.Event()
     
     def connect(self) -> bool:
         """
@@ -399,10 +587,59 @@ class DhanOrderExecutor:
         """
         try:
             self.dhan = dhanhq(self.client_id, self.access_token)
-            return True
         except Exception as e:
             logger.error(f"Failed to connect to Dhan: {e}")
             return False
+        
+        # Pool connections if the SDK routes calls through a Session
+        session = getattr(self.dhan, "session", None)
+        if isinstance(session, requests.Session):
+            # urllib3 does not retry POSTs after the request was sent, so
+            # this cannot duplicate an order
+            adapter = HTTPAdapter(
+                pool_connections=4, pool_maxsize=8,
+                max_retries=Retry(total=2, backoff_factor=0.2)
+            )
+            session.mount("https://", adapter)
+        
+        return True
+    
+    def start_keepalive(self, interval: float = 25) -> None:
+        """
+        Ping a lightweight endpoint periodically on a daemon thread.
+        
+        Keeps the TCP/TLS connection open so orders placed after an idle
+        gap skip the handshake.
+        
+        Args:
+            interval: Seconds between pings
+        """
+        if self._keepalive_thread is not None or self.dhan is None:
+            return
+        
+        self._keepalive_stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop, args=(interval,),
+            name="dhan-keepalive", daemon=True
+        )
+        self._keepalive_thread.start()
+    
+    def stop_keepalive(self) -> None:
+        """Stop the keepalive thread if it is running."""
+        if self._keepalive_thread is None:
+            return
+        
+        self._keepalive_stop.set()
+        self._keepalive_thread.join(timeout=1)
+        self._keepalive_thread = None
+    
+    def _keepalive_loop(self, interval: float) -> None:
+        """Body of the keepalive thread."""
+        while not self._keepalive_stop.wait(interval):
+            try:
+                self.dhan.get_fund_limits()
+            except Exception as e:
+                logger.debug("Dhan keepalive failed: %s", e)
     
     def place_order(self, security_id: str, transaction_type: str,
                     quantity: int, price: float) -> Optional[Dict[str, Any]]:
@@ -418,9 +655,8 @@ class DhanOrderExecutor:
         Returns:
             API response dict or None if failed
         """
-        if not self.dhan:
-            if not self.connect():
-                return None
+        if not self.dhan and not self.connect():
+            return None
         
         try:
             response = self.dhan.place_order(
@@ -441,6 +677,24 @@ class DhanOrderExecutor:
             return None
 
 
+    def place_orders(self, orders: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Place several limit orders concurrently.
+        
+        Args:
+            orders: List of place_order keyword-argument dicts
+                (security_id, transaction_type, quantity, price)
+            
+        Returns:
+            API responses (or None for failures) in the same order
+        """
+        if not orders:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(8, len(orders))) as ex:
+            return list(ex.map(lambda o: self.place_order(**o), orders))
+
+
 # =============================================================================
 # AUTO TRADER
 # =============================================================================
@@ -474,6 +728,9 @@ class AutoTrader:
             config.DHAN_CLIENT_ID,
             config.DHAN_ACCESS_TOKEN
         )
+        # Dry runs never place orders, so only live mode connects up front
+        if not config.DRY_RUN and config.DHAN_ACCESS_TOKEN and self.executor.connect():
+            self.executor.start_keepalive(config.KEEPALIVE_INTERVAL)
         self.strategy = VWAPStrategy()
     
     def fetch_data(self, symbol: str) -> Optional[pd.DataFrame]:
@@ -486,47 +743,76 @@ class AutoTrader:
         Returns:
             DataFrame with OHLCV data or None if failed
         """
-        try:
-            ticker = f"{symbol}.NS"
-            data = yf.download(ticker, period="3mo", interval="1d", progress=False)
-            
-            if isinstance(data.columns, pd.MultiIndex):
-                data.columns = data.columns.get_level_values(0)
-            
-            if data.empty or len(data) < 30:
-                return None
+        return self.fetch_data_batch([symbol]).get(symbol)
+    
+    def fetch_data_batch(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch historical data for several symbols in a single download.
+        
+        Args:
+            symbols: Stock symbols (without .NS suffix)
             
-            df = data.copy()
-            df.columns = [c.lower() for c in df.columns]
-            return df
+        Returns:
+            Dict mapping symbol to OHLCV DataFrame (lowercase columns).
+            Symbols with no data or fewer than 30 bars are omitted.
             
+        Bars are served from the on-disk cache in ohlcv_cache where
+        possible, so repeat runs only download the newest bars.
+        """
+        if not symbols:
+            return {}
+        
+        try:
+            frames = ohlcv_cache.download(
+                {s: f"{s}.NS" for s in symbols},
+                period="3mo", interval="1d", auto_adjust=True,
+                timeout=self.config.FETCH_TIMEOUT
+            )
         except Exception as e:
-            logger.error(f"Data fetch error for {symbol}: {e}")
+            logger.error("Data fetch error for %s: %s", ", ".join(symbols), e)
+            return {}
+        
+        return {s: df for s, df in frames.items() if len(df) >= 30}
+    
+    def _scan_symbol(self, df: Optional[pd.DataFrame]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run the strategy on one symbol's data.
+        
+        Args:
+            df: OHLCV DataFrame, or None if no data was fetched
+            
+        Returns:
+            List of signals, or None if there was no data
+        """
+        if df is None:
             return None
+        return self.strategy.check_signals(df)
     
-    def process_signal(self, symbol: str, signal: Dict[str, Any]) -> Optional[str]:
+    def prepare_order(self, symbol: str, signal: Dict[str, Any],
+                      quantity: Optional[int] = None) -> Optional[Order]:
         """
-        Process a trading signal and place order if valid.
+        Validate a trading signal and size the order.
         
         Args:
             symbol: Stock symbol
             signal: Signal dict with price, sl, tp, action
+            quantity: Precomputed position size (default: calculated here)
             
         Returns:
-            Order ID if successful, None otherwise
+            Sized Order, or None if the signal should not be traded
         """
         # Check if we can place order
         can_place, reason = self.tracker.can_place_order(
             symbol, self.config.MAX_ORDERS_PER_DAY
         )
         if not can_place:
-            logger.warning(f"Cannot place order for {symbol}: {reason}")
+            logger.warning("Cannot place order for %s: %s", symbol, reason)
             return None
         
         # Get security ID
         security_id = SECURITY_IDS.get(symbol)
         if not security_id:
-            logger.error(f"Security ID not found for {symbol}")
+            logger.error("Security ID not found for %s", symbol)
             return None
         
         # Extract signal details
@@ -536,65 +822,147 @@ class AutoTrader:
         action = signal['action']
         
         # Calculate quantity
-        quantity = calculate_quantity(
-            entry, sl, 
-            self.config.CAPITAL_PER_TRADE, 
-            self.config.MAX_RISK_PER_TRADE
-        )
+        if quantity is None:
+            quantity = calculate_quantity(
+                entry, sl, 
+                self.config.CAPITAL_PER_TRADE, 
+                self.config.MAX_RISK_PER_TRADE
+            )
         
         if quantity < 1:
-            logger.warning(f"Quantity too low for {symbol}")
+            logger.warning("Quantity too low for %s", symbol)
             return None
         
-        # Log order details
-        logger.info(f"""
-Order Details for {symbol}:
-  Action: {action}
-  Entry: ₹{entry:,.2f}
-  SL: ₹{sl:,.2f}
-  TP: ₹{tp:,.2f}
-  Quantity: {quantity}
-  Investment: ₹{quantity * entry:,.2f}
-        """)
+        # Log order details (skip the number formatting if INFO is off)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "\nOrder Details for %s:\n"
+                "  Action: %s\n"
+                "  Entry: ₹%s\n"
+                "  SL: ₹%s\n"
+                "  TP: ₹%s\n"
+                "  Quantity: %s\n"
+                "  Investment: ₹%s",
+                symbol, action, f"{entry:,.2f}", f"{sl:,.2f}", f"{tp:,.2f}",
+                quantity, f"{quantity * entry:,.2f}"
+            )
         
-        # DRY RUN mode
-        if self.config.DRY_RUN:
-            order_id = f"DRY_{datetime.now().strftime('%H%M%S')}"
-            logger.info(f"DRY RUN - Order NOT placed: {order_id}")
+        return Order(symbol, security_id, action, entry, sl, tp, quantity)
+    
+    def record_dry_run(self, order: Order) -> str:
+        """
+        Record a simulated order without calling the broker.
+        
+        Args:
+            order: Order from prepare_order
             
-            self.tracker.record_order(
-                symbol, action, entry, sl, tp, quantity, order_id
-            )
-            self.notifier.alert_order_placed(
-                symbol, action, entry, sl, tp, quantity, order_id, 
-                dry_run=True
-            )
-            return order_id
+        Returns:
+            Simulated order ID
+        """
+        now = datetime.now()
+        order_id = f"DRY_{now.strftime('%H%M%S')}"
+        timestamp = now.strftime('%H:%M:%S')
+        logger.info("DRY RUN - Order NOT placed: %s", order_id)
         
-        # LIVE ORDER
-        response = self.executor.place_order(
-            security_id, action, quantity, entry
+        self.tracker.record_order(
+            order.symbol, order.action, order.entry, order.sl,
+            order.tp, order.quantity, order_id, timestamp=timestamp
         )
+        self.notifier.alert_order_placed(
+            order.symbol, order.action, order.entry, order.sl,
+            order.tp, order.quantity, order_id,
+            dry_run=True, timestamp=timestamp
+        )
+        return order_id
+    
+    def handle_order_response(self, order: Order,
+                              response: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Record and alert on the broker response for a live order.
+        
+        Args:
+            order: Order from prepare_order
+            response: Dhan API response, or None if the call failed
+            
+        Returns:
+            Order ID if successful, None otherwise
+        """
+        symbol = order.symbol
         
         if response and response.get('status') == 'success':
             order_id = response.get('orderId', 
                         response.get('data', {}).get('orderId', 'UNKNOWN'))
-            logger.info(f"Order placed successfully: {order_id}")
+            logger.info("Order placed successfully: %s", order_id)
+            timestamp = datetime.now().strftime('%H:%M:%S')
             
             self.tracker.record_order(
-                symbol, action, entry, sl, tp, quantity, order_id
+                symbol, order.action, order.entry, order.sl,
+                order.tp, order.quantity, order_id, timestamp=timestamp
             )
             self.notifier.alert_order_placed(
-                symbol, action, entry, sl, tp, quantity, order_id,
-                dry_run=False
+                symbol, order.action, order.entry, order.sl,
+                order.tp, order.quantity, order_id,
+                dry_run=False, timestamp=timestamp
             )
             return order_id
         else:
             error = response.get('remarks', 'Unknown error') if response else 'No response'
-            logger.error(f"Order failed for {symbol}: {error}")
+            logger.error("Order failed for %s: %s", symbol, error)
             self.notifier.alert_error(symbol, str(error))
             return None
     
+    def process_signal(self, symbol: str, signal: Dict[str, Any]) -> Optional[str]:
+        """
+        Process a trading signal and place order if valid.
+        
+        Args:
+            symbol: Stock symbol
+            signal: Signal dict with price, sl, tp, action
+            
+        Returns:
+            Order ID if successful, None otherwise
+        """
+        order = self.prepare_order(symbol, signal)
+        if order is None:
+            return None
+        
+        # DRY RUN mode
+        if self.config.DRY_RUN:
+            return self.record_dry_run(order)
+        
+        # LIVE ORDER
+        response = self.executor.place_order(
+            order.security_id, order.action, order.quantity, order.entry
+        )
+        return self.handle_order_response(order, response)
+    
+    def submit_orders(self, orders: List[Order]) -> List[Optional[str]]:
+        """
+        Place (or simulate, in dry-run mode) several prepared orders at once.
+        
+        Args:
+            orders: Orders from prepare_order
+            
+        Returns:
+            Order ID for each order, or None where it failed
+        """
+        if self.config.DRY_RUN:
+            return [self.record_dry_run(order) for order in orders]
+        
+        responses = self.executor.place_orders([
+            {
+                'security_id': order.security_id,
+                'transaction_type': order.action,
+                'quantity': order.quantity,
+                'price': order.entry
+            }
+            for order in orders
+        ])
+        return [
+            self.handle_order_response(order, response)
+            for order, response in zip(orders, responses)
+        ]
+    
     def scan_and_trade(self, watchlist: List[str]) -> int:
         """
         Scan watchlist for signals and place orders.
@@ -622,56 +990,103 @@ Order Details for {symbol}:
         mode = "DRY RUN" if self.config.DRY_RUN else "LIVE"
         print(f"{'⚠️' if self.config.DRY_RUN else '🔴'} {mode} MODE\n")
         
-        signals_found = []
-        orders_placed = 0
+        # Only symbols with a Dhan security ID can be traded; skip the
+        # data download for the rest instead of discarding them later
+        tradeable = [s for s in watchlist if s in SECURITY_IDS]
+        untradeable = [s for s in watchlist if s not in SECURITY_IDS]
+        if untradeable:
+            logger.warning("Skipping symbols without security ID: %s",
+                           ", ".join(untradeable))
         
         print("🔍 Scanning for signals...")
         
-        for symbol in watchlist:
+        data = self.fetch_data_batch(tradeable)
+        
+        # A signal is never newer than the last bar, so symbols whose data
+        # is already too old to yield a fresh signal skip the strategy run
+        today = date.today()
+        data_age = {
+            s: (today - df.index[-1].date()).days for s, df in data.items()
+        }
+        to_scan = [
+            s for s in tradeable
+            if s in data and data_age[s] <= self.config.MAX_SIGNAL_AGE_DAYS
+        ]
+        
+        # Run the strategy for every symbol on a thread pool; results come
+        # back in watchlist order so printing stays in the main thread
+        with ThreadPoolExecutor(max_workers=self.config.SCAN_WORKERS) as ex:
+            results = dict(zip(to_scan, ex.map(
+                self._scan_symbol, [data[s] for s in to_scan]
+            )))
+        
+        # Latest signal per symbol and how many days old it is
+        last_signals = {s: sigs[-1] for s, sigs in results.items() if sigs}
+        signal_age = {
+            s: (today - pd.Timestamp(sig['time']).date()).days
+            for s, sig in last_signals.items()
+        }
+        signals_found = [
+            {'symbol': s, 'signal': last_signals[s], 'days_ago': signal_age[s]}
+            for s in tradeable
+            if s in last_signals and signal_age[s] <= self.config.MAX_SIGNAL_AGE_DAYS
+        ]
+        
+        for symbol in tradeable:
             print(f"  Checking {symbol}...", end=" ")
             
-            df = self.fetch_data(symbol)
-            if df is None:
+            if symbol not in data:
                 print("❌ No data")
-                continue
-            
-            signals = self.strategy.check_signals(df)
-            
-            if signals:
-                last_signal = signals[-1]
-                sig_date = pd.Timestamp(last_signal['time']).date()
-                days_ago = (date.today() - sig_date).days
-                
-                if days_ago <= 1:
-                    print(f"✅ {last_signal['action']} signal!")
-                    signals_found.append({
-                        'symbol': symbol,
-                        'signal': last_signal,
-                        'days_ago': days_ago
-                    })
-                else:
-                    print(f"⏭️ Signal {days_ago} days old")
-            else:
+            elif symbol not in results:
+                print(f"⏭️ Data {data_age[symbol]} days old")
+            elif symbol not in last_signals:
                 print("—")
+            elif signal_age[symbol] <= self.config.MAX_SIGNAL_AGE_DAYS:
+                print(f"✅ {last_signals[symbol]['action']} signal!")
+            else:
+                print(f"⏭️ Signal {signal_age[symbol]} days old")
         
         # Process signals
         print(f"\n{'='*60}")
         print(f"  📊 SIGNALS FOUND: {len(signals_found)}")
         print(f"{'='*60}")
         
-        for item in signals_found:
-            symbol = item['symbol']
-            signal = item['signal']
-            
-            print(f"\n📈 Processing {symbol}...")
+        # Size all signals in one vectorized pass
+        quantities = calculate_quantities(
+            [item['signal']['price'] for item in signals_found],
+            [item['signal']['sl'] for item in signals_found],
+            self.config.CAPITAL_PER_TRADE,
+            self.config.MAX_RISK_PER_TRADE
+        )
+        
+        # Submit orders in waves sized to the free daily slots. Only
+        # successful orders are recorded, so slots left by rejected or
+        # failed orders go to the next signals
+        order_ids: List[Optional[str]] = []
+        candidates = list(zip(signals_found, quantities))
+        next_candidate = 0
+        while next_candidate < len(candidates):
+            slots = self.config.MAX_ORDERS_PER_DAY - self.tracker.orders_today()
+            if slots <= 0:
+                print(f"\n⚠️ Daily order limit reached!")
+                break
             
-            order_id = self.process_signal(symbol, signal)
+            wave = []
+            while next_candidate < len(candidates) and len(wave) < slots:
+                item, quantity = candidates[next_candidate]
+                next_candidate += 1
+                
+                print(f"\n📈 Processing {item['symbol']}...")
+                
+                order = self.prepare_order(
+                    item['symbol'], item['signal'], quantity=int(quantity)
+                )
+                if order:
+                    wave.append(order)
             
-            if order_id:
-                orders_placed += 1
-                if orders_placed >= self.config.MAX_ORDERS_PER_DAY:
-                    print(f"\n⚠️ Daily order limit reached!")
-                    break
+            order_ids.extend(self.submit_orders(wave))
+        
+        orders_placed = sum(1 for order_id in order_ids if order_id)
         
         # Summary
         print(f"\n{'='*60}")
@@ -695,22 +1110,28 @@ def main():
     config = Config()
     trader = AutoTrader(config)
     
-    # Startup notification
-    trader.notifier.send(
+    # Startup notification (sent while the scan runs)
+    trader.notifier.send_background(
         f"🤖 <b>Auto-Trading System Started</b>\n\n"
         f"⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
         f"🔶 Mode: {'DRY RUN' if config.DRY_RUN else 'LIVE'}"
     )
     
-    # Run scanner and trader
-    orders = trader.scan_and_trade(WATCHLIST)
-    
-    # Completion notification
-    trader.notifier.send(
-        f"✅ <b>Scan Complete</b>\n\n"
-        f"📦 Orders Placed: {orders}\n"
-        f"⏰ {datetime.now().strftime('%H:%M:%S')}"
-    )
+    try:
+        # Run scanner and trader, collecting order alerts into one digest
+        trader.notifier.batch_mode = True
+        orders = trader.scan_and_trade(WATCHLIST)
+        trader.notifier.flush()
+        
+        # Completion notification (queued behind the startup message and digest)
+        trader.notifier.send_background(
+            f"✅ <b>Scan Complete</b>\n\n"
+            f"📦 Orders Placed: {orders}\n"
+            f"⏰ {datetime.now().strftime('%H:%M:%S')}"
+        )
+    finally:
+        trader.executor.stop_keepalive()
+        trader.notifier.close()
 
 
 if __name__ == "__main__":
@@ -8,23 +8,52 @@ Strategies:
 2. Bollinger Band Mean Reversion (Dip Buying)
 """
 
+import logging
 import os
 import sys
 import pandas as pd
 # import pandas_ta as ta  # Fallback to manual if missing
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Import strategies and data
-from swing_strategies import NIFTY50, fetch_stock_data
-from swing_strategies.supertrend_pivot import scan_stock as scan_supertrend
+from swing_strategies import NIFTY50, fetch_stocks_data
+from swing_strategies.supertrend_pivot import scan_stock as scan_supertrend, true_range
+from swing_strategies.dispatcher import swing_strategy_dispatcher
 
 # Load environment variables
 load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# Allocation used to size each signal
+CAPITAL_PER_TRADE = 100000
+
+# Threads used by get_swing_signals
+SCAN_WORKERS = 16
+
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive session for Telegram requests
+_TG_SESSION = requests.Session()
+
+
+def _format_signal(s):
+    """Format one signal as its block of the Telegram report."""
+    emoji = "🟢" if s['signal'] == "BUY" else "🔴"
+    conf_icon = "🔥" if s.get('confidence', 0) >= 0.8 else "✨"
+    qty = s.get('quantity', 0)
+    inv = s.get('invested_value', 0)
+    
+    return (
+        f"{emoji} <b>{s['symbol']}</b> @ ₹{s['price']:,.2f}\n"
+        f"   Qty: {qty} | Amt: ₹{inv/1000:.1f}k\n"
+        f"   SL: ₹{s['stop_loss']:,.2f} | TGT: ₹{s['target']:,.2f}\n"
+        f"   Reason: {s['reason']} ({int(s.get('confidence',0)*100)}% {conf_icon})\n\n"
+    )
+
 
 def send_telegram_report(signals):
     """Send consolidated report to Telegram."""
@@ -35,7 +64,7 @@ def send_telegram_report(signals):
     if not signals:
         message = f"<b>📉 Daily Swing Scan ({datetime.now().strftime('%d-%b')})</b>\n\nNo high-confidence setups found today."
     else:
-        message = f"<b>🚀 DAILY SWING SIGNALS ({datetime.now().strftime('%d-%b')})</b>\n\n"
+        parts = [f"<b>🚀 DAILY SWING SIGNALS ({datetime.now().strftime('%d-%b')})</b>\n\n"]
         
         # Group by strategy
         strategies = {}
@@ -46,83 +75,97 @@ def send_telegram_report(signals):
             strategies[strat].append(s)
             
         for strat, items in strategies.items():
-            message += f"<b>📌 {strat}</b>\n"
-            for s in items:
-                emoji = "🟢" if s['signal'] == "BUY" else "🔴"
-                conf_icon = "🔥" if s.get('confidence', 0) >= 0.8 else "✨"
-                qty = s.get('quantity', 0)
-                inv = s.get('invested_value', 0)
-                
-                message += f"{emoji} <b>{s['symbol']}</b> @ ₹{s['price']:,.2f}\n"
-                message += f"   Qty: {qty} | Amt: ₹{inv/1000:.1f}k\n"
-                message += f"   SL: ₹{s['stop_loss']:,.2f} | TGT: ₹{s['target']:,.2f}\n"
-                message += f"   Reason: {s['reason']} ({int(s.get('confidence',0)*100)}% {conf_icon})\n\n"
-            message += "----------------------------\n"
+            parts.append(f"<b>📌 {strat}</b>\n")
+            parts.extend(_format_signal(s) for s in items)
+            parts.append("----------------------------\n")
             
-        message += "⚠️ <i>Algo-generated. DYOR.</i>"
+        parts.append("⚠️ <i>Algo-generated. DYOR.</i>")
+        message = "".join(parts)
 
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
     payload = {"chat_id": TELEGRAM_CHAT_ID, "text": message, "parse_mode": "HTML"}
     
     try:
-        requests.post(url, json=payload)
+        _TG_SESSION.post(url, json=payload, timeout=10)
         print("✅ Telegram report sent!")
     except Exception as e:
         print(f"❌ Failed to send Telegram: {e}")
 
 
+def _scan_one(symbol, df):
+    """
+    Run both swing strategies on one symbol's data.
+    Returns the list of sized signals found (possibly empty).
+    """
+    signals = []
+    if df is None or len(df) < 50:
+        return signals
+    
+    try:
+        # Both strategies build ATR from the same True Range; compute it once
+        tr = true_range(df)
+        
+        # --- 1. EXISTING: SuperTrend Pivot --- 
+        st_signal = scan_supertrend(symbol, df, tr=tr)
+        if st_signal and st_signal['signal'] in ['BUY', 'SELL']:
+            if st_signal['confidence'] >= 0.5:
+                st_signal['strategy'] = "SuperTrend Pivot" # Ensure name
+                # Add sizing
+                price = st_signal['entry_price']
+                qty = int(CAPITAL_PER_TRADE / price) if price > 0 else 0
+                st_signal['quantity'] = qty
+                st_signal['invested_value'] = qty * price
+                signals.append(st_signal)
+
+        # --- 2. NEW: Strategy Suite (MACD, BB, EMA, Pullback, Breakout) ---
+        # using the dispatcher which picks the BEST of the suite
+        suite_signal = swing_strategy_dispatcher(df, symbol, tr=tr)
+        
+        if suite_signal and suite_signal.get('signal') != 'HOLD':
+            # Avoid duplicates if same strategy logic/name
+            # (Though SuperTrend is distinct from the suite)
+            
+            # Add sizing
+            price = suite_signal.get('entry_price', 0)
+            if price > 0:
+                qty = int(CAPITAL_PER_TRADE / price)
+                suite_signal['quantity'] = qty
+                suite_signal['invested_value'] = qty * price
+                suite_signal['price'] = price # Normalize key if needed
+                signals.append(suite_signal)
+            
+    except Exception as e:
+        logger.warning("Error scanning %s: %s", symbol, e)
+    
+    return signals
+
+
 def get_swing_signals(symbols):
     """
     Run ALL swing strategies on a list of symbols.
     Returns list of signal dictionaries with 100k allocation sizing.
     """
-    from swing_strategies.dispatcher import swing_strategy_dispatcher
-    
     all_signals = []
     total = len(symbols)
-    CAPITAL_PER_TRADE = 100000
     
-    for idx, symbol in enumerate(symbols):
-        print(f"\r[{idx+1}/{total}] Scanning {symbol:<15}", end="", flush=True)
-        
-        try:
-            # Fetch data once (shared)
-            df = fetch_stock_data(symbol, period="1y")
-            if df.empty or len(df) < 50:
-                continue
-
-            # --- 1. EXISTING: SuperTrend Pivot --- 
-            st_signal = scan_supertrend(symbol, df)
-            if st_signal and st_signal['signal'] in ['BUY', 'SELL']:
-                if st_signal['confidence'] >= 0.5:
-                    st_signal['strategy'] = "SuperTrend Pivot" # Ensure name
-                    # Add sizing
-                    price = st_signal['entry_price']
-                    qty = int(CAPITAL_PER_TRADE / price) if price > 0 else 0
-                    st_signal['quantity'] = qty
-                    st_signal['invested_value'] = qty * price
-                    all_signals.append(st_signal)
-
-            # --- 2. NEW: Strategy Suite (MACD, BB, EMA, Pullback, Breakout) ---
-            # using the dispatcher which picks the BEST of the suite
-            suite_signal = swing_strategy_dispatcher(df, symbol)
-            
-            if suite_signal and suite_signal.get('signal') != 'HOLD':
-                 # Avoid duplicates if same strategy logic/name
-                 # (Though SuperTrend is distinct from the suite)
-                 
-                 # Add sizing
-                 price = suite_signal.get('entry_price', 0)
-                 if price > 0:
-                     qty = int(CAPITAL_PER_TRADE / price)
-                     suite_signal['quantity'] = qty
-                     suite_signal['invested_value'] = qty * price
-                     suite_signal['price'] = price # Normalize key if needed
-                     all_signals.append(suite_signal)
-                
-        except Exception as e:
-            # print(f"Error {symbol}: {e}")
-            continue
+    # Fetch data for all symbols in one request (shared by both strategies)
+    data = fetch_stocks_data(symbols, period="1y")
+    
+    # Strategy work is independent per symbol; pandas releases the GIL
+    # for most of it, so run symbols on a thread pool. Progress is printed
+    # as symbols finish, from the main thread only.
+    results = {}
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+        futures = {ex.submit(_scan_one, s, data.get(s)): s for s in symbols}
+        for done, future in enumerate(as_completed(futures), start=1):
+            symbol = futures[future]
+            print(f"\r[{done}/{total}] Scanned {symbol:<15}", end="", flush=True)
+            results[symbol] = future.result()
+    
+    # Collect in watchlist order so ties in confidence sort the same way
+    # every run
+    for symbol in symbols:
+        all_signals.extend(results[symbol])
             
     # Sort by confidence
     all_signals.sort(key=lambda x: x.get('confidence', 0), reverse=True)
@@ -130,6 +173,10 @@ def get_swing_signals(symbols):
 
 
 def main():
+    # yfinance reports failed tickers through its logger; quiet it for this
+    # CLI run only, so library and API callers still see download errors
+    logging.getLogger("yfinance").setLevel(logging.CRITICAL)
+
     print("=" * 60)
     print(f"🚀 RUNNING DAILY SWING SCAN ({datetime.now().strftime('%Y-%m-%d')})")
     print("=" * 60)
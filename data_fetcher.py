@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 from dhanhq import dhanhq
 import logging
 from datetime import datetime, timedelta
@@ -6,12 +7,32 @@ import config
 import yfinance as yf
 import os
 
+import ohlcv_cache
+
+# Columns of the Dhan compact security list that fetch_ohlc needs. Explicit
+# dtypes skip type sniffing; exchange/segment/instrument are low-cardinality.
+SECURITY_LIST_DTYPES = {
+    'SEM_TRADING_SYMBOL': str,
+    'SEM_SMST_SECURITY_ID': 'int64',
+    'SEM_EXM_EXCH_ID': 'category',
+    'SEM_SEGMENT': 'category',
+    'SEM_INSTRUMENT_NAME': 'category',
+}
+
+# Short OHLCV keys some Dhan responses use
+DHAN_SHORT_COLUMNS = {'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume'}
+
+# Index symbols whose Yahoo Finance ticker isn't just "<symbol>.NS"
+YF_INDEX_TICKERS = {"NIFTY": "^NSEI", "BANKNIFTY": "^NSEBANK"}
+
 class DhanFetcher:
     def __init__(self):
         self.client_id = config.DHAN_CLIENT_ID
         self.access_token = config.DHAN_ACCESS_TOKEN
         self.logger = logging.getLogger(__name__)
         self.security_map = None
+        self._by_symbol = None
+        self._details_cache = {}
         self.dhan = None
         
         # Initialize Dhan client
@@ -40,35 +61,62 @@ class DhanFetcher:
 
         if os.path.exists(csv_file):
             try:
-                # Load CSV
-                self.security_map = pd.read_csv(csv_file)
+                parquet_file = os.path.splitext(csv_file)[0] + ".parquet"
+                if (os.path.exists(parquet_file) and
+                        os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file)):
+                    # Columnar mirror written on an earlier run
+                    self.security_map = pd.read_parquet(parquet_file)
+                else:
+                    # Load CSV
+                    self.security_map = pd.read_csv(
+                        csv_file,
+                        usecols=list(SECURITY_LIST_DTYPES),
+                        dtype=SECURITY_LIST_DTYPES,
+                    )
+                    try:
+                        self.security_map.to_parquet(parquet_file)
+                    except Exception as e:
+                        self.logger.warning(f"Could not write {parquet_file}: {e}")
+                self._by_symbol = self._index_by_symbol(self.security_map)
+                self._details_cache = {}
                 self.logger.info(f"Loaded {len(self.security_map)} securities.")
             except Exception as e:
                 self.logger.error(f"Error loading security list CSV: {e}")
 
+    @staticmethod
+    def _index_by_symbol(security_map):
+        """
+        Build a one-row-per-symbol lookup table indexed by SEM_TRADING_SYMBOL.
+        
+        When a symbol is listed on several exchanges the first NSE row wins,
+        otherwise the first row in the file.
+        """
+        # Prefer Equity (NSE) or Index
+        # The compact list columns: SEM_EXM_EXCH_ID, SEM_SEGMENT, SEM_SMST_SECURITY_ID...
+        # known exchanges: NSE, BSE.
+        is_nse = security_map['SEM_EXM_EXCH_ID'] == 'NSE'
+        ordered = pd.concat([security_map[is_nse], security_map[~is_nse]])
+        unique = ordered.drop_duplicates(subset='SEM_TRADING_SYMBOL', keep='first')
+        return unique.set_index('SEM_TRADING_SYMBOL', drop=False)
+
     def get_security_details(self, symbol):
-        if self.security_map is None:
+        if self._by_symbol is None:
             return None
         
-        # Filter for symbol (Exact match on SEM_TRADING_SYMBOL)
-        res = self.security_map[self.security_map['SEM_TRADING_SYMBOL'] == symbol]
+        # Rows are materialised once per symbol; the cache is reset
+        # whenever the security list is reloaded
+        if symbol in self._details_cache:
+            return self._details_cache[symbol]
         
-        if res.empty:
+        # Exact match on SEM_TRADING_SYMBOL (hash lookup on a unique index)
+        try:
+            row = self._by_symbol.loc[symbol]
+        except KeyError:
             # Try appending '-EQ' or similar if not found?
-            return None
+            row = None
         
-        # Prefer Equity (NSE) or Index
-        # We try to pick the one with 'NSE' in exchange segment usually
-        # The compact list columns: SEM_EXM_EXCH_ID, SEM_SEGMENT, SEM_SMST_SECURITY_ID...
-        # 'SEM_EXM_SEG_ID' was incorrect guess. It seems 'SEM_EXM_EXCH_ID' is the exchange?
-        
-        # known: NSE, BSE.
-        if len(res) > 1:
-            nse_match = res[res['SEM_EXM_EXCH_ID'] == 'NSE']
-            if not nse_match.empty:
-                return nse_match.iloc[0]
-                
-        return res.iloc[0]
+        self._details_cache[symbol] = row
+        return row
 
     def fetch_ohlc(self, symbol, timeframe, days=5, start_date=None, end_date=None):
         """
@@ -129,50 +177,50 @@ class DhanFetcher:
 
             # Parse Response
             # Response: {'status': 'success', 'data': {'start_Time': [...], 'open': [...], ...}}
-            df = pd.DataFrame(data)
+            # Build the frame straight from the response lists: no
+            # intermediate frame of every key, no rename/select/astype passes
             
             # Convert Dhan Time to Datetime
             # Dhan time format logic (Dhan uses 'start_Time' usually)
             
             time_col = None
-            if 'start_Time' in df.columns:
+            if 'timestamp' in data:
+                 time_col = 'timestamp'
+            elif 'start_Time' in data:
                  time_col = 'start_Time'
-            elif 'k' in df.columns: # Sometimes keys are short
+            elif 'k' in data: # Sometimes keys are short
                  time_col = 'k'
                  
-            if time_col:
+            if time_col == 'timestamp':
+                 # v2 timestamps are epoch seconds: convert the whole array
+                 # at once to naive IST instead of per element
+                 index = pd.to_datetime(
+                     np.asarray(data[time_col], dtype=np.int64), unit='s', utc=True
+                 ).tz_convert('Asia/Kolkata').tz_localize(None)
+                 index = pd.DatetimeIndex(index, name='datetime')
+            elif time_col:
                  try:
                      # Dhan uses a custom integer format sometimes requiring conversion
                      # But convert_to_date_time helper is reliable if self.dhan is active
-                     times = self.dhan.convert_to_date_time(df[time_col].tolist())
-                     df['datetime'] = times
+                     times = self.dhan.convert_to_date_time(list(data[time_col]))
                  except Exception as e:
                      self.logger.warning(f"Time conversion failed: {e}")
                      # Fallback: if it's already epoch?
-                     df['datetime'] = df[time_col]
-
-                 df = df.set_index('datetime')
-                 df.index = pd.to_datetime(df.index)
+                     times = data[time_col]
+                 
+                 index = pd.DatetimeIndex(pd.to_datetime(times), name='datetime')
             else:
                  self.logger.warning("No time column found in Dhan response. Falling back to YFinance.")
                  return self.fetch_yfinance_data(symbol, timeframe, days, start_date, end_date)
-                 
-            # Rename Columns
-            df = df.rename(columns={
-                'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 'v': 'volume' # Some APIs use short names
-            })
-            # Ensure standard names if keys were full names
-            df = df.rename(columns={
-                'open': 'open', 'high': 'high', 'low': 'low', 'close': 'close', 'volume': 'volume'
-            })
             
-            # Select required columns
+            # Map short keys (o, h, ...) to standard names and keep the
+            # OHLCV columns, in order, as float64 arrays
+            columns = {DHAN_SHORT_COLUMNS.get(k, k): v for k, v in data.items()}
             req_cols = ['open', 'high', 'low', 'close', 'volume']
-            existing_cols = [c for c in req_cols if c in df.columns]
-            df = df[existing_cols]
-            
-            # Ensure float
-            df = df.astype(float)
+            df = pd.DataFrame(
+                {c: np.asarray(columns[c], dtype=np.float64) for c in req_cols if c in columns},
+                index=index,
+            )
             
             return df
 
@@ -187,18 +235,24 @@ class DhanFetcher:
         tf_map = {'1': '1m', '5': '5m', '15': '15m', '60': '1h'}
         interval = tf_map.get(timeframe, '1d')
         
-        if symbol == "NIFTY":
-            yf_symbol = "^NSEI"
-        elif symbol == "BANKNIFTY":
-            yf_symbol = "^NSEBANK"
-        else:
-            yf_symbol = f"{symbol}.NS"
+        yf_symbol = YF_INDEX_TICKERS.get(symbol) or f"{symbol}.NS"
             
         try:
             # Use start/end if provided
             if start_date and end_date:
                 # yf.download expects YYYY-MM-DD strings usually
-                df = yf.download(yf_symbol, start=start_date, end=end_date, interval=interval, progress=False)
+                def download():
+                    return self._normalize_yfinance(yf.download(
+                        yf_symbol, start=start_date, end=end_date, interval=interval, progress=False
+                    ))
+                
+                # A range that ended before today won't change; serve
+                # repeat requests from disk
+                if str(end_date) < datetime.now().strftime('%Y-%m-%d'):
+                    return ohlcv_cache.cached_range(
+                        yf_symbol, str(start_date), str(end_date), interval, download
+                    )
+                return download()
             else:
                 period = "1mo"
                 if days <= 1: period = "1d"
@@ -206,27 +260,31 @@ class DhanFetcher:
                 elif days <= 30: period = "1mo"
                 elif days <= 90: period = "3mo"
                 df = yf.download(yf_symbol, period=period, interval=interval, progress=False)
-            
-            if df.empty:
-                return None
-            
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = df.columns.get_level_values(0)
-            
-            df = df.rename(columns={
-                "Open": "open", "High": "high", "Low": "low", 
-                "Close": "close", "Volume": "volume"
-            })
-            
-            req = ['open', 'high', 'low', 'close', 'volume']
-            if not all(col in df.columns for col in req):
-                return None
-                
-            return df[req]
+                return self._normalize_yfinance(df)
 
         except Exception as e:
             self.logger.error(f"YFinance Error: {e}")
             return None
 
+    @staticmethod
+    def _normalize_yfinance(df):
+        """Flatten and lowercase a single-ticker yfinance frame to OHLCV columns."""
+        if df.empty:
+            return None
+        
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
+        
+        df = df.rename(columns={
+            "Open": "open", "High": "high", "Low": "low", 
+            "Close": "close", "Volume": "volume"
+        })
+        
+        req = ['open', 'high', 'low', 'close', 'volume']
+        if not all(col in df.columns for col in req):
+            return None
+            
+        return df[req]
+
     def get_market_status(self):
         return True
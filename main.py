@@ -16,6 +16,18 @@ from daily_swing_scan import get_swing_signals, send_telegram_report
 # Add Indices to the scan list
 WATCHLIST = ["^NSEI", "^NSEBANK"] + NIFTY50
 
+# Smart Sectors Definition (Verified Performers)
+SMART_SECTORS = frozenset([
+    # IT
+    "TCS", "INFY", "HCLTECH", "WIPRO", "TECHM", "LTIM",
+    # BANKING
+    "HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK", "INDUSINDBK",
+    # AUTO
+    "MARUTI", "M&M", "TATAMOTORS", "BAJAJ-AUTO", "EICHERMOT", "HEROMOTOCO",
+    # PHARMA
+    "SUNPHARMA", "DRREDDY", "CIPLA", "DIVISLAB", "APOLLOHOSP"
+])
+
 def run_daily_scan():
     """Run the daily swing trading scan."""
     print("=" * 60)
@@ -26,22 +38,11 @@ def run_daily_scan():
     # 1. Run Swing Scan
     signals = get_swing_signals(WATCHLIST)
     
-    # Smart Sectors Definition (Verified Performers)
-    SMART_SECTORS = [
-        # IT
-        "TCS", "INFY", "HCLTECH", "WIPRO", "TECHM", "LTIM",
-        # BANKING
-        "HDFCBANK", "ICICIBANK", "SBIN", "KOTAKBANK", "AXISBANK", "INDUSINDBK",
-        # AUTO
-        "MARUTI", "M&M", "TATAMOTORS", "BAJAJ-AUTO", "EICHERMOT", "HEROMOTOCO",
-        # PHARMA
-        "SUNPHARMA", "DRREDDY", "CIPLA", "DIVISLAB", "APOLLOHOSP"
-    ]
-
     print("\n\n✅ Scan Complete.")
     
     if signals:
         print(f"\nFound {len(signals)} signals!")
+        open_trades = None
         for s in signals:
             # Tagging Smart Strategy
             if s['symbol'] in SMART_SECTORS:
@@ -53,9 +54,13 @@ def run_daily_scan():
             # Only trade valid BUY signals with high confidence
             if s['signal'] == 'BUY' and s['confidence'] >= 0.6:
                 try:
-                    from trade_manager import execute_trade
+                    from trade_manager import execute_trade, get_open_trades
+                    # Read open positions once; refresh only after a new trade
+                    if open_trades is None:
+                        open_trades = get_open_trades('STOCK')
                     print(f"  ⚡ Executing paper trade for {s['symbol']}...")
-                    execute_trade(s)
+                    if execute_trade(s, open_trades):
+                        open_trades = None
                 except Exception as e:
                     print(f"  ❌ Trade failed: {e}")
                     
@@ -0,0 +1,397 @@
+"""
+On-disk cache for daily OHLCV bars from Yahoo Finance.
+
+Bars are stored per (symbol, interval) as Parquet files under .cache/ohlcv.
+On later runs only the bars from the last cached date onwards are
+downloaded and appended. The download is skipped entirely once the cache
+holds the closing bar of the last trading day. Each symbol is re-downloaded
+in full once a week, or sooner if a tail download shows the older bars
+were re-adjusted for a split or dividend.
+
+Fixed historical date ranges (any interval) can also be cached whole with
+cached_range, keyed by a hash of the request.
+
+Usage:
+    import ohlcv_cache
+
+    frames = ohlcv_cache.download({"TCS": "TCS.NS"}, period="3mo")
+    df = frames["TCS"]   # lowercase open/high/low/close/volume columns
+
+    # Arbitrary windows go by date instead of period
+    frames = ohlcv_cache.download({"^NSEI": "^NSEI"}, start="2024-01-15")
+"""
+
+import os
+import hashlib
+import logging
+import tempfile
+from datetime import datetime, timedelta, time as dtime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yfinance as yf
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(".cache", "ohlcv")
+
+# NSE closes at 15:30; a bar cached after that is final for the day
+MARKET_CLOSE = dtime(15, 30)
+
+# On weekends nothing changes, so a cache file written after Friday's close
+# is trusted for this long even if it has no Friday bar (market holiday)
+WEEKEND_TTL_SECONDS = 24 * 3600
+
+# Rebuild from scratch after this long so split/dividend adjustments in
+# older bars don't go stale forever. Measured from the last full download,
+# which is kept in the Parquet metadata: tail updates rewrite the file, so
+# its mtime can't be used
+MAX_CACHE_AGE_SECONDS = 7 * 24 * 3600
+FETCHED_AT_KEY = b"ohlcv_fetched_at"
+
+# Relative difference in an overlapping close that means Yahoo re-adjusted
+# the history since it was cached
+ADJUSTMENT_TOLERANCE = 1e-4
+
+# The first bar of a period can land a few days after its nominal start
+# (weekends, holidays)
+PERIOD_SLACK = pd.Timedelta(days=7)
+
+_PERIOD_OFFSETS = {
+    "d": lambda n: pd.DateOffset(days=n),
+    "mo": lambda n: pd.DateOffset(months=n),
+    "y": lambda n: pd.DateOffset(years=n),
+}
+
+# Periods Yahoo accepts that map to a fixed start date ("ytd" and "max"
+# don't); anything else makes yf.download return an empty frame
+VALID_PERIODS = ("1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y")
+
+
+def cache_path(symbol: str, interval: str = "1d", auto_adjust: bool = True) -> str:
+    """Return the Parquet file path for a symbol's cached bars."""
+    suffix = "" if auto_adjust else "_raw"
+    return os.path.join(CACHE_DIR, f"{symbol}_{interval}{suffix}.parquet")
+
+
+def period_start(period: str, now: Optional[datetime] = None) -> pd.Timestamp:
+    """
+    Convert a yfinance period string ("5d", "3mo", "1y") to its start date.
+
+    Raises ValueError for periods not in VALID_PERIODS.
+    """
+    if period not in VALID_PERIODS:
+        raise ValueError(
+            f"Unsupported period: {period} (expected one of {', '.join(VALID_PERIODS)})"
+        )
+
+    now = now or datetime.now()
+    for unit, offset in _PERIOD_OFFSETS.items():
+        if period.endswith(unit) and period[:-len(unit)].isdigit():
+            return pd.Timestamp(now.date()) - offset(int(period[:-len(unit)]))
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def fetched_at(path: str) -> Optional[float]:
+    """Return when the cached file's bars were last downloaded in full, or None."""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        return float(metadata[FETCHED_AT_KEY])
+    except Exception:
+        return None
+
+
+def write(path: str, df: pd.DataFrame, fetched: float) -> None:
+    """
+    Write bars to Parquet, recording the time of the last full download.
+
+    The file is written next to its destination and renamed into place,
+    so scans in other processes never read a half-written file.
+    """
+    table = pa.Table.from_pandas(df)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FETCHED_AT_KEY] = repr(fetched).encode()
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load(path: str, now: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+    """
+    Load cached bars, or None if missing, expired or unreadable.
+
+    Files without a full-download time (written before it was recorded)
+    count as expired.
+    """
+    if not os.path.exists(path):
+        return None
+
+    now = now or datetime.now()
+    fetched = fetched_at(path)
+    if fetched is None or now.timestamp() - fetched > MAX_CACHE_AGE_SECONDS:
+        return None
+
+    try:
+        cached = pd.read_parquet(path)
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache %s: %s", path, e)
+        return None
+
+    return cached if not cached.empty else None
+
+
+def is_fresh(path: str, cached: pd.DataFrame, now: Optional[datetime] = None) -> bool:
+    """
+    Check whether cached bars are current enough to skip downloading.
+
+    Fresh means the file was written after the last trading day's market
+    close and holds that day's bar. On weekends the last trading day is
+    Friday; a file written after Friday's close without a Friday bar (a
+    market holiday) is also trusted for WEEKEND_TTL_SECONDS.
+    """
+    now = now or datetime.now()
+    mtime = os.path.getmtime(path)
+
+    last_day = now.date()
+    if now.weekday() >= 5:
+        last_day -= timedelta(days=now.weekday() - 4)
+
+    # A bar written during market hours is partial even if read after close
+    close_ts = datetime.combine(last_day, MARKET_CLOSE).timestamp()
+    if mtime < close_ts:
+        return False
+
+    if cached.index[-1].date() == last_day:
+        return True
+    return now.date() != last_day and now.timestamp() - mtime < WEEKEND_TTL_SECONDS
+
+
+def store(path: str, cached: Optional[pd.DataFrame], new: pd.DataFrame,
+          now: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Merge newly downloaded bars into the cache and write it back.
+
+    New bars replace cached bars on the same date, so a partial bar cached
+    during market hours is overwritten by the final one. Without cached
+    bars this is a full download and restarts the MAX_CACHE_AGE_SECONDS
+    clock; merging a tail keeps the existing full-download time.
+    """
+    now = now or datetime.now()
+    fetched = now.timestamp()
+
+    if cached is not None:
+        merged = pd.concat([cached, new])
+        merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+        fetched = fetched_at(path) or fetched
+    else:
+        merged = new
+
+    write(path, merged, fetched)
+    return merged
+
+
+def adjustments_changed(cached: pd.DataFrame, new: pd.DataFrame) -> bool:
+    """
+    Check whether a tail download disagrees with the cached bars it overlaps.
+
+    The last cached bar is skipped since it may have been partial. Any
+    other mismatch in close means Yahoo re-adjusted the history (split or
+    dividend) and the cached bars are stale.
+    """
+    overlap = new.index.intersection(cached.index[:-1])
+    if overlap.empty:
+        return False
+
+    old_close = cached.loc[overlap, "close"].to_numpy(dtype=float)
+    new_close = new.loc[overlap, "close"].to_numpy(dtype=float)
+    return not np.allclose(old_close, new_close, rtol=ADJUSTMENT_TOLERANCE,
+                           equal_nan=True)
+
+
+def split_batch(data: pd.DataFrame, tickers: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a group_by='ticker' batch download into per-ticker frames.
+
+    Columns are lowercased and dates a ticker has no data for are dropped.
+    Tickers absent from the batch are omitted. Some yfinance versions
+    return flat columns for a single ticker even with group_by='ticker';
+    that frame is taken as the one ticker's data.
+    """
+    if data.empty:
+        return {}
+
+    if not isinstance(data.columns, pd.MultiIndex):
+        if len(tickers) != 1:
+            return {}
+        df = data.dropna(how="all")
+        if df.empty:
+            return {}
+        df.columns = [c.lower() for c in df.columns]
+        return {tickers[0]: df}
+
+    available = set(data.columns.get_level_values(0))
+    frames: Dict[str, pd.DataFrame] = {}
+
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+
+        # Rows are aligned across tickers, so drop dates this one lacks
+        df = data[ticker].dropna(how="all")
+        if df.empty:
+            continue
+
+        df.columns = [c.lower() for c in df.columns]
+        frames[ticker] = df
+
+    return frames
+
+
+def range_cache_path(ticker: str, start: str, end: str, interval: str) -> str:
+    """Return the Parquet path for a fixed (ticker, start, end, interval) request."""
+    key = hashlib.md5(f"{ticker}|{start}|{end}|{interval}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, "ranges", f"{key}.parquet")
+
+
+def cached_range(ticker: str, start: str, end: str, interval: str,
+                 fetch: Callable[[], Optional[pd.DataFrame]]) -> Optional[pd.DataFrame]:
+    """
+    Serve a fixed date-range download from disk, calling fetch() on a miss.
+
+    Intended for historical ranges whose bars no longer change; entries
+    expire after MAX_CACHE_AGE_SECONDS like the rest of the cache. Empty
+    or failed fetches are not cached.
+    """
+    path = range_cache_path(ticker, start, end, interval)
+    cached = load(path)
+    if cached is not None:
+        return cached
+
+    df = fetch()
+    if df is not None and not df.empty:
+        try:
+            write(path, df, datetime.now().timestamp())
+        except Exception as e:
+            logger.warning("Could not cache %s: %s", path, e)
+    return df
+
+
+def download(tickers: Dict[str, str], period: Optional[str] = None,
+             interval: str = "1d", auto_adjust: bool = True, timeout: float = 10,
+             start: Optional[str] = None,
+             end: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch bars for many symbols, using the on-disk cache where possible.
+
+    Symbols whose cache is fresh are served from disk. Symbols with a
+    cache that covers the window only download the bars since their last
+    cached dates, and the rest download the full window. Each group is a
+    single batched yf.download call. Tails that show re-adjusted history
+    join the full-window batch, which runs after the tail batch.
+
+    Args:
+        tickers: Mapping of symbol to Yahoo Finance ticker
+        period: yfinance period string, one of VALID_PERIODS
+        interval: Bar interval (default "1d")
+        auto_adjust: Passed to yfinance; adjusted and raw bars are cached
+            separately
+        timeout: Per-request timeout in seconds passed to yfinance, so a
+            stalled Yahoo endpoint fails fast instead of hanging the scan
+        start: First date to return ("YYYY-MM-DD"), instead of period
+        end: Return only bars before this date (exclusive, like yfinance)
+
+    Returns:
+        Dict mapping symbol to a DataFrame with lowercase OHLCV columns,
+        trimmed to the requested window. Symbols with no data are omitted.
+    """
+    if (period is None) == (start is None):
+        raise ValueError("Pass exactly one of period or start")
+
+    if period is not None:
+        window_start = period_start(period)
+        full_window = {"period": period}
+    else:
+        window_start = pd.Timestamp(start).normalize()
+        full_window = {"start": window_start.strftime("%Y-%m-%d")}
+
+    frames: Dict[str, pd.DataFrame] = {}
+    cached_frames: Dict[str, pd.DataFrame] = {}
+    full: List[str] = []
+    tail: List[str] = []
+
+    for symbol in tickers:
+        path = cache_path(symbol, interval, auto_adjust)
+        cached = load(path)
+
+        # A tail needs two cached bars: the last may be partial, and the one
+        # before it is compared to detect re-adjusted history
+        if (cached is None or len(cached) < 2
+                or cached.index[0] > window_start + PERIOD_SLACK):
+            full.append(symbol)
+        elif is_fresh(path, cached):
+            frames[symbol] = cached
+        else:
+            cached_frames[symbol] = cached
+            tail.append(symbol)
+
+    def fetch(symbols: List[str], window: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        batch_tickers = [tickers[s] for s in symbols]
+        data = yf.download(
+            batch_tickers, interval=interval, group_by="ticker",
+            threads=True, progress=False, auto_adjust=auto_adjust,
+            timeout=timeout, **window
+        )
+        new_frames = split_batch(data, batch_tickers)
+        return {s: new_frames[tickers[s]] for s in symbols if tickers[s] in new_frames}
+
+    if tail:
+        # Start one bar before the last cached date: that bar is re-fetched
+        # in case it was partial, and the one before it is the overlap check
+        tail_start = min(cached_frames[s].index[-2] for s in tail)
+        new_frames = fetch(tail, {"start": tail_start.strftime("%Y-%m-%d")})
+
+        for symbol in tail:
+            cached = cached_frames[symbol]
+            new = new_frames.get(symbol)
+
+            if new is None:
+                frames[symbol] = cached
+            elif adjustments_changed(cached, new):
+                logger.info("%s history was re-adjusted, refetching in full", symbol)
+                full.append(symbol)
+            else:
+                frames[symbol] = store(
+                    cache_path(symbol, interval, auto_adjust), cached, new
+                )
+
+    if full:
+        new_frames = fetch(full, full_window)
+
+        for symbol in full:
+            new = new_frames.get(symbol)
+            if new is None:
+                # Better stale bars than none if the refetch came back empty
+                if symbol in cached_frames:
+                    frames[symbol] = cached_frames[symbol]
+                continue
+
+            frames[symbol] = store(
+                cache_path(symbol, interval, auto_adjust), None, new
+            )
+
+    frames = {s: df[df.index >= window_start] for s, df in frames.items()}
+    if end is not None:
+        end_ts = pd.Timestamp(end)
+        frames = {s: df[df.index < end_ts] for s, df in frames.items()}
+    return frames
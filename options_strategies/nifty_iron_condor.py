@@ -16,11 +16,12 @@ Usage:
 
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from dataclasses import dataclass
 from typing import Dict, Optional
 from datetime import datetime
 
+import ohlcv_cache
+
 
 @dataclass
 class IronCondorSetup:
@@ -80,14 +81,9 @@ class NiftyIronCondor:
         self.stop_pct = stop_pct
     
     def fetch_data(self) -> pd.DataFrame:
-        """Fetch NIFTY data."""
-        data = yf.download("^NSEI", period="6mo", interval="1d", progress=False)
-        
-        if isinstance(data.columns, pd.MultiIndex):
-            data.columns = data.columns.get_level_values(0)
-        
-        data.columns = [c.lower() for c in data.columns]
-        return data
+        """Fetch NIFTY data (served from the on-disk OHLCV cache when fresh)."""
+        frames = ohlcv_cache.download({"^NSEI": "^NSEI"}, period="6mo", interval="1d")
+        return frames.get("^NSEI", pd.DataFrame())
     
     def calculate_indicators(self, df: pd.DataFrame) -> Dict:
         """Calculate all required indicators."""
@@ -112,11 +108,11 @@ class NiftyIronCondor:
         is_sideways = dist_ema20 < 1.5 and dist_ema50 < 2.5
         
         # IV Rank (BB Width proxy)
+        # Upper minus lower band is 4 std; compute that spread once and
+        # reuse it for both the width series and the squeeze check
         bb_mid = close.rolling(20).mean()
-        bb_std = close.rolling(20).std()
-        bb_upper = bb_mid + (bb_std * 2)
-        bb_lower = bb_mid - (bb_std * 2)
-        bb_width = (bb_upper - bb_lower) / bb_mid
+        bb_spread = close.rolling(20).std() * 4
+        bb_width = bb_spread / bb_mid
         
         # Normalize over 100 days
         min_w = bb_width.rolling(100).min().iloc[-1]
@@ -127,7 +123,7 @@ class NiftyIronCondor:
         
         # Squeeze detection
         atr = (df['high'] - df['low']).rolling(14).mean().iloc[-1]
-        squeeze = (bb_upper.iloc[-1] - bb_lower.iloc[-1]) < (atr * 3)
+        squeeze = bb_spread.iloc[-1] < (atr * 3)
         
         return {
             'spot': spot,
@@ -157,12 +153,16 @@ class NiftyIronCondor:
         # ATM ~ 1.5% of spot, decay exponentially OTM
         base_premium = spot * 0.012
         
-        call_sell_prem = base_premium * np.exp(-self.wing_distance / spot * 8)
-        call_buy_prem = base_premium * np.exp(-(self.wing_distance + self.spread_width) / spot * 8)
-        put_sell_prem = base_premium * np.exp(-self.wing_distance / spot * 8)
-        put_buy_prem = base_premium * np.exp(-(self.wing_distance + self.spread_width) / spot * 8)
+        # All four legs priced in one vector op, from their distance to spot
+        # (call sell, call buy, put sell, put buy)
+        distances = np.array([
+            self.wing_distance, self.wing_distance + self.spread_width,
+            self.wing_distance, self.wing_distance + self.spread_width,
+        ], dtype=np.float64)
+        premiums = base_premium * np.exp(-distances / spot * 8)
         
-        net_credit = (call_sell_prem - call_buy_prem + put_sell_prem - put_buy_prem)
+        # Credit from the short legs minus debit for the long legs
+        net_credit = float(premiums @ np.array([1.0, -1.0, 1.0, -1.0]))
         
         max_profit = net_credit * self.LOT_SIZE
         max_loss = (self.spread_width - net_credit) * self.LOT_SIZE
@@ -1,58 +1,74 @@
 import pandas as pd
 import numpy as np
-import yfinance as yf
 from datetime import datetime, timedelta
 
+def _ensure_datetime(df, cols):
+    """
+    Return df with the given columns as datetime64, parsing only the ones
+    that are not already. The input frame is left untouched.
+    """
+    parsed = {c: pd.to_datetime(df[c]) for c in cols if df[c].dtype.kind != 'M'}
+    return df.assign(**parsed) if parsed else df
+
 def calculate_strategy_metrics(df):
     """
     Calculate comprehensive metrics for each strategy:
     - Win Rate, Profit Factor, Max Drawdown, Avg Hold Time
+
+    All strategies are computed together: one sort by exit time, grouped
+    cumulative sums for the equity curves and one groupby aggregation.
     """
     if df.empty:
         return {}
-        
-    metrics = {}
-    strategies = df['strategy'].unique()
     
-    for strat in strategies:
-        strat_df = df[df['strategy'] == strat].copy()
-        strat_df = strat_df.sort_values('exit_time')
-        
-        # Basic Stats
-        total_trades = len(strat_df)
-        winners = strat_df[strat_df['pnl'] > 0]
-        losers = strat_df[strat_df['pnl'] <= 0]
-        
-        win_rate = (len(winners) / total_trades) * 100 if total_trades > 0 else 0
+    # We assume base capital 100k per strategy for standardized comparison
+    base_capital = 100000.0
+    
+    # Ensure dates are datetime, then order each strategy's trades by exit
+    trades = _ensure_datetime(df, ['entry_time', 'exit_time']).sort_values('exit_time', kind='mergesort')
+    
+    pnl = trades['pnl']
+    by_strategy = trades['strategy']
+    
+    trades['is_win'] = pnl > 0
+    trades['gross_profit'] = pnl.where(pnl > 0, 0.0)
+    trades['gross_loss'] = -pnl.where(pnl <= 0, 0.0)
+    trades['hold_days'] = (trades['exit_time'] - trades['entry_time']).dt.total_seconds() / (24 * 3600)
+    
+    # Max Drawdown: per-strategy equity curve and running peak
+    equity = base_capital + pnl.groupby(by_strategy, observed=True).cumsum()
+    peak = equity.groupby(by_strategy, observed=True).cummax()
+    trades['drawdown'] = (equity - peak) / peak * 100
+    
+    agg = trades.groupby('strategy', observed=True).agg(
+        total_trades=('pnl', 'size'),
+        winners=('is_win', 'sum'),
+        gross_profit=('gross_profit', 'sum'),
+        gross_loss=('gross_loss', 'sum'),
+        avg_hold_days=('hold_days', 'mean'),
+        max_drawdown=('drawdown', 'min'),
+        total_pnl=('pnl', 'sum'),
+    )
+    
+    # Keep strategies in the order they first appear in the input
+    agg = agg.reindex(df['strategy'].dropna().unique())
+    
+    metrics = {}
+    for row in agg.itertuples():
+        total_trades = int(row.total_trades)
+        win_rate = (row.winners / total_trades) * 100 if total_trades > 0 else 0
         
         # Profit Factor
-        gross_profit = winners['pnl'].sum()
-        gross_loss = abs(losers['pnl'].sum())
-        profit_factor = round(gross_profit / gross_loss, 2) if gross_loss > 0 else float('inf')
-        
-        # Avg Hold Time
-        # Ensure dates are datetime
-        strat_df['exit_time'] = pd.to_datetime(strat_df['exit_time'])
-        strat_df['entry_time'] = pd.to_datetime(strat_df['entry_time'])
-        
-        strat_df['hold_days'] = (strat_df['exit_time'] - strat_df['entry_time']).dt.total_seconds() / (24 * 3600)
-        avg_hold_days = round(strat_df['hold_days'].mean(), 1)
+        gross_loss = abs(row.gross_loss)
+        profit_factor = round(row.gross_profit / gross_loss, 2) if gross_loss > 0 else float('inf')
         
-        # Max Drawdown
-        # We assume base capital 100k per strategy for standardized comparison
-        base_capital = 100000.0
-        strat_df['equity'] = base_capital + strat_df['pnl'].cumsum()
-        strat_df['peak'] = strat_df['equity'].cummax()
-        strat_df['drawdown'] = (strat_df['equity'] - strat_df['peak']) / strat_df['peak'] * 100
-        max_dd = round(strat_df['drawdown'].min(), 2)
-        
-        metrics[strat] = {
+        metrics[row.Index] = {
             'total_trades': total_trades,
             'win_rate': round(win_rate, 1),
             'profit_factor': profit_factor,
-            'avg_hold_days': avg_hold_days,
-            'max_drawdown': max_dd,
-            'total_pnl': strat_df['pnl'].sum()
+            'avg_hold_days': round(row.avg_hold_days, 1),
+            'max_drawdown': round(row.max_drawdown, 2),
+            'total_pnl': row.total_pnl
         }
         
     return metrics
@@ -60,8 +76,16 @@ def calculate_strategy_metrics(df):
 def get_benchmark_data(start_date, end_date=None):
     """
     Fetch Nifty 50 data and normalize to 100k base for comparison.
-    Returns list of {'x': date, 'y': value}
+    Returns list of {'x': date, 'y': value}, with dates formatted like the
+    strategy equity series so both land on the same local-time axis.
+
+    Daily bars come from the on-disk OHLCV cache, so dashboard reloads
+    only hit Yahoo for bars the cache does not hold yet.
     """
+    # Imported here: ohlcv_cache pulls in yfinance, which the other
+    # analytics functions don't need
+    import ohlcv_cache
+    
     if not end_date:
         end_date = datetime.now()
         
@@ -69,11 +93,13 @@ def get_benchmark_data(start_date, end_date=None):
         # Buffer start date by a few days to ensure we cover the range
         start = pd.to_datetime(start_date) - timedelta(days=5)
         
-        # Fetch Nifty 50
+        # Fetch Nifty 50 (end is exclusive, as in yfinance)
         ticker = "^NSEI" 
-        df = yf.download(ticker, start=start, end=end_date, progress=False)
+        df = ohlcv_cache.download(
+            {ticker: ticker}, start=start.strftime("%Y-%m-%d"), end=end_date
+        ).get(ticker)
         
-        if df.empty:
+        if df is None or df.empty:
             return []
             
         # Normalize to 100k
@@ -83,26 +109,15 @@ def get_benchmark_data(start_date, end_date=None):
         if df.empty:
             return []
             
-        start_price = df['Close'].iloc[0]
-        # Handle MultiIndex if present (yfinance update)
-        if isinstance(start_price, pd.Series):
-             start_price = start_price.iloc[0]
-             
+        close = df['close'].to_numpy(dtype=np.float64)
+        
         # Calculate factor
-        factor = 100000.0 / start_price
+        factor = 100000.0 / close[0]
         
         # Create series
-        chart_data = []
-        for index, row in df.iterrows():
-            val = row['Close']
-            if isinstance(val, pd.Series):
-                val = val.iloc[0]
-                
-            norm_val = val * factor
-            chart_data.append({
-                'x': index.strftime('%Y-%m-%d %H:%M:%S'),
-                'y': round(norm_val, 2)
-            })
+        xs = df.index.strftime('%Y-%m-%d %H:%M:%S').tolist()
+        ys = np.round(close * factor, 2).tolist()
+        chart_data = [{'x': x, 'y': y} for x, y in zip(xs, ys)]
             
         return chart_data
         
@@ -118,27 +133,14 @@ def calculate_monthly_heatmap(df):
     if df.empty:
         return {}
         
-    df['exit_time'] = pd.to_datetime(df['exit_time'])
-    df['year'] = df['exit_time'].dt.year
-    df['month'] = df['exit_time'].dt.strftime('%b') # Jan, Feb..
-    df['month_num'] = df['exit_time'].dt.month
-    
-    # Pivot
-    heatmap = {}
+    df = _ensure_datetime(df, ['exit_time'])
     
-    # Group by Year, Month
-    monthly = df.groupby(['year', 'month', 'month_num'])['pnl'].sum().reset_index()
-    monthly = monthly.sort_values(['year', 'month_num'])
+    # Group by calendar month (one integer-backed Period key), in order
+    monthly = df.groupby(df['exit_time'].dt.to_period('M'))['pnl'].sum().sort_index()
     
-    for _, row in monthly.iterrows():
-        y = str(row['year'])
-        m = row['month']
-        val = row['pnl']
-        
-        if y not in heatmap:
-            heatmap[y] = {}
-        
-        heatmap[y][m] = val
+    heatmap = {}
+    for period, val in monthly.items():
+        heatmap.setdefault(str(period.year), {})[period.strftime('%b')] = float(val) # Jan, Feb..
         
     return heatmap
 
@@ -1,5 +1,6 @@
 from strategies.base import BaseStrategy
 import pandas as pd
+import numpy as np
 
 class RSIDivergenceStrategy(BaseStrategy):
     """
@@ -40,39 +41,57 @@ class RSIDivergenceStrategy(BaseStrategy):
         if len(df) < 60:
             return signals
         
-        df = df.copy()
-        df.columns = [c.lower() for c in df.columns]
+        # Indicators are kept as local series/arrays rather than new
+        # columns, so the caller's frame is only read: no copy needed
+        if any(c != c.lower() for c in df.columns):
+            df = df.rename(columns=str.lower)
         
         # --- Indicators ---
-        df['rsi'] = self._calculate_rsi(df['close'], self.rsi_period)
-        df['ema50'] = df['close'].ewm(span=50, adjust=False).mean()
-        df['ema20'] = df['close'].ewm(span=20, adjust=False).mean()
+        rsi = self._calculate_rsi(df['close'], self.rsi_period)
         
         # ATR for stop loss
-        df['tr'] = df['high'] - df['low']
-        df['atr'] = df['tr'].rolling(14).mean()
+        atr = (df['high'] - df['low']).rolling(14).mean()
         
         # Volume filter
-        df['vol_avg'] = df['volume'].rolling(20).mean()
-        df['vol_spike'] = df['volume'] > (df['vol_avg'] * 1.2)
+        vol_spike = df['volume'] > (df['volume'].rolling(20).mean() * 1.2)
         
         # Body size (momentum)
-        df['body'] = abs(df['close'] - df['open'])
-        df['body_avg'] = df['body'].rolling(10).mean()
-        df['strong_candle'] = df['body'] > (df['body_avg'] * 0.8)
+        body = abs(df['close'] - df['open'])
+        strong_candle = body > (body.rolling(10).mean() * 0.8)
         
         # --- Find Swing Points (Williams Fractals - 5 bar) ---
-        swing_lows = []
-        swing_highs = []
+        # Compare each bar with its centred 5-bar window in one vectorized
+        # pass; the first and last two bars have no full window
+        lows = df['low'].to_numpy()
+        highs = df['high'].to_numpy()
+        rsis = rsi.to_numpy()
         
-        for i in range(2, len(df) - 2):
-            # Swing Low: lowest of 5 bars
-            if df['low'].iloc[i] <= df['low'].iloc[i-2:i+3].min():
-                swing_lows.append({'idx': i, 'price': df['low'].iloc[i], 'rsi': df['rsi'].iloc[i]})
-            
-            # Swing High: highest of 5 bars
-            if df['high'].iloc[i] >= df['high'].iloc[i-2:i+3].max():
-                swing_highs.append({'idx': i, 'price': df['high'].iloc[i], 'rsi': df['rsi'].iloc[i]})
+        # Confirmation-candle columns, read by position below instead of
+        # building a row Series per candidate with df.iloc
+        n = len(df)
+        opens = df['open'].to_numpy()
+        closes = df['close'].to_numpy()
+        atrs = atr.to_numpy()
+        strong = strong_candle.to_numpy()
+        vol_spike = vol_spike.to_numpy()
+        
+        # Swing Low: lowest of 5 bars. Copies, since to_numpy() can return a
+        # read-only view under copy-on-write and the edges are cleared below
+        is_swing_low = (df['low'] <= df['low'].rolling(5, center=True, min_periods=1).min()).to_numpy(copy=True)
+        # Swing High: highest of 5 bars
+        is_swing_high = (df['high'] >= df['high'].rolling(5, center=True, min_periods=1).max()).to_numpy(copy=True)
+        
+        is_swing_low[:2] = is_swing_low[-2:] = False
+        is_swing_high[:2] = is_swing_high[-2:] = False
+        
+        swing_lows = [
+            {'idx': int(i), 'price': lows[i], 'rsi': rsis[i]}
+            for i in np.flatnonzero(is_swing_low)
+        ]
+        swing_highs = [
+            {'idx': int(i), 'price': highs[i], 'rsi': rsis[i]}
+            for i in np.flatnonzero(is_swing_high)
+        ]
         
         # --- Detect Bullish Divergence ---
         for i in range(1, len(swing_lows)):
@@ -101,20 +120,19 @@ class RSIDivergenceStrategy(BaseStrategy):
             # Trend filter: Allow counter-trend but prefer with trend
             idx = curr['idx']
             # Check next candle for confirmation
-            if idx + 1 >= len(df):
+            if idx + 1 >= n:
                 continue
             
             confirm_idx = idx + 1
-            confirm_candle = df.iloc[confirm_idx]
             
             # Bullish confirmation candle
-            is_bullish = confirm_candle['close'] > confirm_candle['open']
-            is_strong = confirm_candle['strong_candle'] if pd.notna(confirm_candle['strong_candle']) else True
-            has_volume = confirm_candle['vol_spike'] if pd.notna(confirm_candle['vol_spike']) else True
+            is_bullish = closes[confirm_idx] > opens[confirm_idx]
+            is_strong = strong[confirm_idx]
+            has_volume = vol_spike[confirm_idx]
             
             if price_ll and rsi_hl and rsi_oversold and is_bullish and (is_strong or has_volume):
-                entry = confirm_candle['close']
-                atr = df['atr'].iloc[confirm_idx] if pd.notna(df['atr'].iloc[confirm_idx]) else entry * 0.02
+                entry = closes[confirm_idx]
+                atr = atrs[confirm_idx] if pd.notna(atrs[confirm_idx]) else entry * 0.02
                 sl = curr['price'] - (atr * 0.5)  # Below swing low
                 risk = entry - sl
                 
@@ -152,19 +170,18 @@ class RSIDivergenceStrategy(BaseStrategy):
             rsi_overbought = curr_rsi > 65
             
             idx = curr['idx']
-            if idx + 1 >= len(df):
+            if idx + 1 >= n:
                 continue
             
             confirm_idx = idx + 1
-            confirm_candle = df.iloc[confirm_idx]
             
-            is_bearish = confirm_candle['close'] < confirm_candle['open']
-            is_strong = confirm_candle['strong_candle'] if pd.notna(confirm_candle['strong_candle']) else True
-            has_volume = confirm_candle['vol_spike'] if pd.notna(confirm_candle['vol_spike']) else True
+            is_bearish = closes[confirm_idx] < opens[confirm_idx]
+            is_strong = strong[confirm_idx]
+            has_volume = vol_spike[confirm_idx]
             
             if price_hh and rsi_lh and rsi_overbought and is_bearish and (is_strong or has_volume):
-                entry = confirm_candle['close']
-                atr = df['atr'].iloc[confirm_idx] if pd.notna(df['atr'].iloc[confirm_idx]) else entry * 0.02
+                entry = closes[confirm_idx]
+                atr = atrs[confirm_idx] if pd.notna(atrs[confirm_idx]) else entry * 0.02
                 sl = curr['price'] + (atr * 0.5)
                 risk = sl - entry
                 
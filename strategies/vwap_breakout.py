@@ -148,67 +148,57 @@ class VWAPStrategy(BaseStrategy):
         if len(df) < 30:
             return signals
         
-        # Ensure lowercase columns
-        df = df.copy()
-        df.columns = [c.lower() for c in df.columns]
-        
-        # Calculate indicators
-        df['vwap'] = self._calculate_vwap(df)
-        df['ema'] = df['close'].ewm(span=self.ema_period, adjust=False).mean()
-        df['atr'] = self._calculate_atr(df)
-        
-        # Previous values for crossover detection
-        df['prev_close'] = df['close'].shift(1)
-        df['prev_vwap'] = df['vwap'].shift(1)
-        
-        # Scan for signals
-        for i in range(25, len(df)):
-            close = df['close'].iloc[i]
-            prev_close = df['prev_close'].iloc[i]
-            vwap = df['vwap'].iloc[i]
-            prev_vwap = df['prev_vwap'].iloc[i]
-            ema = df['ema'].iloc[i]
-            atr = df['atr'].iloc[i]
-            time = df.index[i]
-            
-            # Skip if any indicator is NaN
-            if pd.isna(vwap) or pd.isna(ema) or pd.isna(atr):
-                continue
-            
-            # BUY: Cross above VWAP + Close > EMA
-            cross_above_vwap = (prev_close <= prev_vwap) and (close > vwap)
-            above_ema = close > ema
-            
-            if cross_above_vwap and above_ema:
-                sl = close - (atr * 1.5)
-                risk = close - sl
-                tp = close + (risk * self.rr_ratio)
-                
-                signals.append({
-                    'action': 'BUY',
-                    'price': close,
-                    'sl': sl,
-                    'tp': tp,
-                    'time': time,
-                    'reason': f"VWAP Long: Cross above VWAP {vwap:.2f}, EMA {ema:.2f}"
-                })
+        # Ensure lowercase columns; the frame is only read below, so rename
+        # into a new frame only when needed instead of copying every time
+        if any(c != c.lower() for c in df.columns):
+            df = df.rename(columns=str.lower)
+        
+        # Calculate indicators once as raw float64 arrays
+        close = df['close'].to_numpy(dtype=np.float64)
+        vwap = self._calculate_vwap(df).to_numpy(dtype=np.float64)
+        ema = df['close'].ewm(span=self.ema_period, adjust=False).mean().to_numpy(dtype=np.float64)
+        atr = self._calculate_atr(df).to_numpy(dtype=np.float64)
+        index = df.index
+        
+        # Evaluate the entry rules for every bar at once; bar i is compared
+        # with bar i-1, and scanning starts at bar 25
+        curr_close, prev_close = close[25:], close[24:-1]
+        curr_vwap, prev_vwap = vwap[25:], vwap[24:-1]
+        curr_ema, curr_atr = ema[25:], atr[25:]
+        
+        # Skip if any indicator is NaN
+        valid = ~(np.isnan(curr_vwap) | np.isnan(curr_ema) | np.isnan(curr_atr))
+        
+        # BUY: Cross above VWAP + Close > EMA
+        buy = valid & (prev_close <= prev_vwap) & (curr_close > curr_vwap) & (curr_close > curr_ema)
+        # SELL: Cross below VWAP + Close < EMA
+        sell = valid & (prev_close >= prev_vwap) & (curr_close < curr_vwap) & (curr_close < curr_ema)
+        
+        # Only the (few) signal bars are turned into dicts, in bar order
+        for k in np.flatnonzero(buy | sell):
+            i = k + 25
+            price, bar_vwap, bar_ema, bar_atr = close[i], vwap[i], ema[i], atr[i]
             
-            # SELL: Cross below VWAP + Close < EMA
-            cross_below_vwap = (prev_close >= prev_vwap) and (close < vwap)
-            below_ema = close < ema
+            if buy[k]:
+                sl = price - (bar_atr * 1.5)
+                risk = price - sl
+                tp = price + (risk * self.rr_ratio)
+                action = 'BUY'
+                reason = f"VWAP Long: Cross above VWAP {bar_vwap:.2f}, EMA {bar_ema:.2f}"
+            else:
+                sl = price + (bar_atr * 1.5)
+                risk = sl - price
+                tp = price - (risk * self.rr_ratio)
+                action = 'SELL'
+                reason = f"VWAP Short: Cross below VWAP {bar_vwap:.2f}, EMA {bar_ema:.2f}"
             
-            if cross_below_vwap and below_ema:
-                sl = close + (atr * 1.5)
-                risk = sl - close
-                tp = close - (risk * self.rr_ratio)
-                
-                signals.append({
-                    'action': 'SELL',
-                    'price': close,
-                    'sl': sl,
-                    'tp': tp,
-                    'time': time,
-                    'reason': f"VWAP Short: Cross below VWAP {vwap:.2f}, EMA {ema:.2f}"
-                })
+            signals.append({
+                'action': action,
+                'price': price,
+                'sl': sl,
+                'tp': tp,
+                'time': index[i],
+                'reason': reason
+            })
         
         return signals
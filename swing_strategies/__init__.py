@@ -7,10 +7,14 @@ Inspired by CA Rachana Ranade's method
 Holding period: 2-10 days
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import yfinance as yf
 import pandas as pd
 from typing import Dict, List, Optional
 
+import ohlcv_cache
+
 from .supertrend_pivot import (
     supertrend_pivot_swing,
     swing_strategy_dispatcher,
@@ -19,10 +23,22 @@ from .supertrend_pivot import (
     SwingSignal,
     calculate_supertrend,
     calculate_pivot_points,
-    calculate_atr
+    calculate_atr,
+    true_range
 )
 
 
+# Threads used by scan_stocks
+SCAN_WORKERS = 8
+
+
+def _yf_ticker(symbol: str) -> str:
+    """Map an NSE symbol (or a ^ index) to its Yahoo Finance ticker."""
+    if symbol.startswith("^"):
+        return symbol
+    return f"{symbol}.NS"
+
+
 def fetch_stock_data(symbol: str, period: str = "6mo") -> pd.DataFrame:
     """
     Fetch daily OHLCV data from Yahoo Finance.
@@ -34,31 +50,14 @@ def fetch_stock_data(symbol: str, period: str = "6mo") -> pd.DataFrame:
     Returns:
         Daily OHLCV DataFrame
     """
-    if symbol.startswith("^"):
-        ticker = symbol
-    else:
-        ticker = f"{symbol}.NS"
+    ticker = _yf_ticker(symbol)
     try:
-        # Suppress yfinance error output
-        import sys
-        import io
-        suppress_stdout = io.StringIO()
-        original_stdout = sys.stdout
-        sys.stdout = suppress_stdout
-        
-        try:
-            df = yf.download(ticker, period=period, interval="1d", progress=False, threads=False)
-        finally:
-            sys.stdout = original_stdout
+        df = yf.download(ticker, period=period, interval="1d", progress=False, threads=False)
         
         if df.empty:
             # Try BSE as fallback
             ticker_bse = f"{symbol}.BO"
-            sys.stdout = suppress_stdout
-            try:
-                df = yf.download(ticker_bse, period=period, interval="1d", progress=False, threads=False)
-            finally:
-                sys.stdout = original_stdout
+            df = yf.download(ticker_bse, period=period, interval="1d", progress=False, threads=False)
             
         if df.empty:
              # print(f"⚠️ No data for {symbol}")
@@ -75,6 +74,43 @@ def fetch_stock_data(symbol: str, period: str = "6mo") -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def fetch_stocks_data(symbols: List[str], period: str = "6mo") -> Dict[str, pd.DataFrame]:
+    """
+    Fetch daily OHLCV data for many symbols with batched Yahoo Finance requests.
+    
+    Bars are served from the on-disk cache in ohlcv_cache where possible.
+    Symbols missing from the batch result are retried one by one with
+    fetch_stock_data (which also tries the BSE listing).
+    
+    Args:
+        symbols: Stock symbols (without .NS suffix) or ^ indices
+        period: Data period (default 6mo)
+    
+    Returns:
+        Dict mapping symbol to daily OHLCV DataFrame (lowercase columns).
+        Symbols with no data are omitted.
+    """
+    if not symbols:
+        return {}
+    
+    try:
+        frames = ohlcv_cache.download(
+            {s: _yf_ticker(s) for s in symbols},
+            period=period, interval="1d", auto_adjust=True
+        )
+    except Exception as e:
+        print(f"Error fetching batch: {e}")
+        frames = {}
+    
+    for symbol in symbols:
+        if symbol not in frames:
+            df = fetch_stock_data(symbol, period)
+            if not df.empty:
+                frames[symbol] = df
+    
+    return frames
+
+
 def scan_symbol(symbol: str, period: str = "6mo") -> Optional[Dict]:
     """
     Fetch data and scan single symbol for signals.
@@ -86,9 +122,10 @@ def scan_symbol(symbol: str, period: str = "6mo") -> Optional[Dict]:
     Returns:
         Signal dict if found, else None
     """
-    df = fetch_stock_data(symbol, period)
+    # Goes through the on-disk cache, so re-runs on the same day are local
+    df = fetch_stocks_data([symbol], period).get(symbol)
     
-    if df.empty or len(df) < 50:
+    if df is None or len(df) < 50:
         return None
     
     return swing_strategy_dispatcher(symbol, df)
@@ -105,16 +142,22 @@ def scan_stocks(symbols: List[str], period: str = "6mo") -> List[Dict]:
     Returns:
         List of signals sorted by confidence
     """
-    signals = []
-    
-    for symbol in symbols:
+    # Concurrent yf.download calls share module-level state in yfinance,
+    # so fetch everything in one batched call and parallelise the scans
+    data = fetch_stocks_data(symbols, period)
+    
+    def scan_one(symbol: str) -> Optional[Dict]:
+        df = data.get(symbol)
+        if df is None or len(df) < 50:
+            return None
         try:
-            signal = scan_symbol(symbol, period)
-            if signal:
-                signals.append(signal)
+            return swing_strategy_dispatcher(symbol, df)
         except Exception as e:
             print(f"Error scanning {symbol}: {e}")
-            continue
+            return None
+    
+    with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as ex:
+        signals = [signal for signal in ex.map(scan_one, symbols) if signal]
     
     # Sort by confidence
     signals.sort(key=lambda x: x['confidence'], reverse=True)
@@ -133,9 +176,9 @@ def analyze_stock(symbol: str, period: str = "6mo") -> Dict:
     Returns:
         Full analysis dict
     """
-    df = fetch_stock_data(symbol, period)
+    df = fetch_stocks_data([symbol], period).get(symbol)
     
-    if df.empty or len(df) < 50:
+    if df is None or len(df) < 50:
         return {"error": "Insufficient data", "symbol": symbol}
     
     return get_market_analysis(symbol, df)
@@ -169,6 +212,7 @@ __all__ = [
     
     # Convenience functions
     'fetch_stock_data',
+    'fetch_stocks_data',
     'scan_symbol',
     'scan_stocks',
     'analyze_stock',
@@ -178,6 +222,7 @@ __all__ = [
     'calculate_supertrend',
     'calculate_pivot_points',
     'calculate_atr',
+    'true_range',
     
     # Data
     'SwingSignal',
@@ -12,20 +12,23 @@ from .indicators import calculate_indicators
 from .strategies import ALL_STRATEGIES
 
 
-def swing_strategy_dispatcher(df: pd.DataFrame, symbol: str) -> Dict:
+def swing_strategy_dispatcher(df: pd.DataFrame, symbol: str,
+                              tr: Optional[pd.Series] = None) -> Dict:
     """
     Main dispatcher for swing trading strategies.
     
     Args:
         df: OHLCV DataFrame (daily candles, min 200 bars)
         symbol: Stock symbol
+        tr: Precomputed True Range of df, shared with other strategies
+            run on the same data (optional)
         
     Returns:
         Best signal as dictionary
     """
     # Calculate all indicators
     try:
-        indicators = calculate_indicators(df)
+        indicators = calculate_indicators(df, tr=tr)
     except Exception as e:
         return {
             "symbol": symbol,
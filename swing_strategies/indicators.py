@@ -6,15 +6,71 @@ Calculates all required indicators from OHLCV data.
 
 import pandas as pd
 import numpy as np
+from typing import Optional
 from .models import MarketIndicators
+from .supertrend_pivot import true_range
 
 
-def calculate_indicators(df: pd.DataFrame) -> MarketIndicators:
+def _tail_mean_std(values: np.ndarray, window: int) -> tuple:
+    """
+    Mean and sample std (ddof=1) of the last `window` values.
+    
+    Matches the last element of pandas rolling(window).mean()/.std():
+    NaN if there are fewer than `window` values or any of them is NaN.
+    """
+    if len(values) < window:
+        return np.nan, np.nan
+    
+    tail = values[-window:]
+    return float(tail.mean()), float(tail.std(ddof=1))
+
+
+def _tail_rsi(close: np.ndarray, period: int = 14) -> tuple:
+    """
+    Latest and previous RSI of a close array (SMA of gains and losses).
+    
+    Matches the last two elements of the diff/where/rolling(period).mean()
+    RSI series, but only averages the last `period` price changes for
+    each instead of building the full gain, loss and RS series. Like
+    where(), NaN changes count as zero gain and loss.
+    """
+    delta = np.diff(close, prepend=np.nan)
+    gain = np.fmax(delta, 0.0)
+    loss = np.fmax(-delta, 0.0)
+    
+    def rsi_at(end: int) -> float:
+        if end < period:
+            return np.nan
+        avg_gain = gain[end - period:end].mean()
+        avg_loss = loss[end - period:end].mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(100 - (100 / (1 + avg_gain / avg_loss)))
+    
+    n = len(close)
+    last = rsi_at(n)
+    return last, (rsi_at(n - 1) if n > 1 else last)
+
+
+def _last_two(series: pd.Series) -> tuple:
+    """
+    Latest and previous value of a series as plain floats.
+    
+    Reads the underlying array once instead of going through iloc for
+    each scalar. The previous value falls back to the latest one for a
+    single-row series.
+    """
+    values = series.to_numpy(dtype=np.float64)
+    last = float(values[-1])
+    return last, (float(values[-2]) if len(values) > 1 else last)
+
+
+def calculate_indicators(df: pd.DataFrame, tr: Optional[pd.Series] = None) -> MarketIndicators:
     """
     Calculate all technical indicators from OHLCV DataFrame.
     
     Args:
         df: DataFrame with columns: open, high, low, close, volume
+        tr: Precomputed True Range of df, if the caller already has it
         
     Returns:
         MarketIndicators object with all calculated values
@@ -31,13 +87,6 @@ def calculate_indicators(df: pd.DataFrame) -> MarketIndicators:
     ema50 = close.ewm(span=50, adjust=False).mean()
     ema200 = close.ewm(span=200, adjust=False).mean()
     
-    # === RSI ===
-    delta = close.diff()
-    gain = delta.where(delta > 0, 0).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    
     # === MACD ===
     ema12 = close.ewm(span=12, adjust=False).mean()
     ema26 = close.ewm(span=26, adjust=False).mean()
@@ -46,32 +95,37 @@ def calculate_indicators(df: pd.DataFrame) -> MarketIndicators:
     macd_histogram = macd - macd_signal
     
     # === ATR ===
-    tr = pd.DataFrame({
-        'hl': high - low,
-        'hc': abs(high - close.shift(1)),
-        'lc': abs(low - close.shift(1))
-    }).max(axis=1)
+    if tr is None:
+        tr = true_range(df)
     atr = tr.rolling(14).mean()
     
+    close_arr = close.to_numpy(dtype=np.float64)
+    
+    # === RSI ===
+    # Only the latest two values are used
+    curr_rsi, prev_rsi = _tail_rsi(close_arr, 14)
+    
     # === Bollinger Bands ===
-    bb_mid = close.rolling(20).mean()
-    bb_std = close.rolling(20).std()
+    # Only the latest band values are used, so compute them from the last
+    # 20 closes instead of building full rolling series
+    bb_mid, bb_std = _tail_mean_std(close_arr, 20)
     bb_upper = bb_mid + (bb_std * 2)
     bb_lower = bb_mid - (bb_std * 2)
     bb_width = (bb_upper - bb_lower) / bb_mid
     
     # === Volume ===
-    volume_avg = df['volume'].rolling(20).mean()
+    volume_arr = df['volume'].to_numpy(dtype=np.float64)
+    volume_avg, _ = _tail_mean_std(volume_arr, 20)
     
     # === Swing High/Low (5-bar pivots) ===
     swing_high = high.rolling(5, center=True).max().shift(-2).fillna(method='ffill')
     swing_low = low.rolling(5, center=True).min().shift(-2).fillna(method='ffill')
     
     # === Trend Detection ===
-    curr_close = close.iloc[-1]
-    curr_ema20 = ema20.iloc[-1]
-    curr_ema50 = ema50.iloc[-1]
-    curr_ema200 = ema200.iloc[-1]
+    curr_close = float(close_arr[-1])
+    curr_ema20, prev_ema20 = _last_two(ema20)
+    curr_ema50, prev_ema50 = _last_two(ema50)
+    curr_ema200, _ = _last_two(ema200)
     
     if curr_close > curr_ema20 > curr_ema50 > curr_ema200:
         trend = "UP"
@@ -80,39 +134,43 @@ def calculate_indicators(df: pd.DataFrame) -> MarketIndicators:
     else:
         trend = "SIDEWAYS"
     
+    curr_macd, prev_macd = _last_two(macd)
+    curr_macd_signal, prev_macd_signal = _last_two(macd_signal)
+    curr_volume = float(volume_arr[-1])
+    
     # Get current and previous values
     return MarketIndicators(
         close=curr_close,
-        high=high.iloc[-1],
-        low=low.iloc[-1],
-        open=df['open'].iloc[-1],
+        high=_last_two(high)[0],
+        low=_last_two(low)[0],
+        open=_last_two(df['open'])[0],
         
         ema20=curr_ema20,
         ema50=curr_ema50,
         ema200=curr_ema200,
         
-        rsi=rsi.iloc[-1],
-        macd=macd.iloc[-1],
-        macd_signal=macd_signal.iloc[-1],
-        macd_histogram=macd_histogram.iloc[-1],
+        rsi=curr_rsi,
+        macd=curr_macd,
+        macd_signal=curr_macd_signal,
+        macd_histogram=_last_two(macd_histogram)[0],
         
-        atr=atr.iloc[-1],
-        bb_upper=bb_upper.iloc[-1],
-        bb_lower=bb_lower.iloc[-1],
-        bb_width=bb_width.iloc[-1],
+        atr=_last_two(atr)[0],
+        bb_upper=bb_upper,
+        bb_lower=bb_lower,
+        bb_width=bb_width,
         
-        volume=df['volume'].iloc[-1],
-        volume_avg=volume_avg.iloc[-1],
-        volume_ratio=df['volume'].iloc[-1] / volume_avg.iloc[-1] if volume_avg.iloc[-1] > 0 else 1,
+        volume=curr_volume,
+        volume_avg=volume_avg,
+        volume_ratio=curr_volume / volume_avg if volume_avg > 0 else 1,
         
-        swing_high=swing_high.iloc[-1],
-        swing_low=swing_low.iloc[-1],
+        swing_high=_last_two(swing_high)[0],
+        swing_low=_last_two(swing_low)[0],
         trend=trend,
         
         # Previous values
-        prev_ema20=ema20.iloc[-2] if len(ema20) > 1 else curr_ema20,
-        prev_ema50=ema50.iloc[-2] if len(ema50) > 1 else curr_ema50,
-        prev_macd=macd.iloc[-2] if len(macd) > 1 else macd.iloc[-1],
-        prev_macd_signal=macd_signal.iloc[-2] if len(macd_signal) > 1 else macd_signal.iloc[-1],
-        prev_rsi=rsi.iloc[-2] if len(rsi) > 1 else rsi.iloc[-1]
+        prev_ema20=prev_ema20,
+        prev_ema50=prev_ema50,
+        prev_macd=prev_macd,
+        prev_macd_signal=prev_macd_signal,
+        prev_rsi=prev_rsi
     )
@@ -34,6 +34,7 @@ This strategy combines trend direction filters with support/resistance breakout
    - AVOID: Low beta FMCG stocks (HINDUNILVR, ITC).
 """
 
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
@@ -74,10 +75,30 @@ class SwingSignal:
 # INDICATOR CALCULATIONS
 # =============================================================================
 
-def calculate_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0) -> Tuple[pd.Series, pd.Series]:
+def true_range(df: pd.DataFrame) -> pd.Series:
+    """
+    Calculate the True Range series.
+    
+    Shared by SuperTrend and ATR so callers that need both can compute it
+    once and pass it in.
+    """
+    high = df['high']
+    low = df['low']
+    close = df['close']
+    
+    tr1 = high - low
+    tr2 = abs(high - close.shift(1))
+    tr3 = abs(low - close.shift(1))
+    return pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+
+def calculate_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float = 3.0,
+                         tr: Optional[pd.Series] = None) -> Tuple[pd.Series, pd.Series]:
     """
     Calculate SuperTrend indicator.
     
+    Pass a precomputed True Range as `tr` to avoid recomputing it.
+    
     Returns:
         supertrend: SuperTrend line values
         direction: 1 for bullish (green), -1 for bearish (red)
@@ -87,10 +108,8 @@ def calculate_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float =
     close = df['close']
     
     # Calculate ATR
-    tr1 = high - low
-    tr2 = abs(high - close.shift(1))
-    tr3 = abs(low - close.shift(1))
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+    if tr is None:
+        tr = true_range(df)
     atr = tr.rolling(window=period).mean()
     
     # Calculate basic bands
@@ -98,25 +117,30 @@ def calculate_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float =
     upper_band = hl2 + (multiplier * atr)
     lower_band = hl2 - (multiplier * atr)
     
+    # The recursion below runs on plain float arrays; per-element iloc
+    # reads and writes on a Series dominate the runtime otherwise
+    close_arr = close.to_numpy(dtype=float)
+    upper_arr = upper_band.to_numpy(dtype=float)
+    lower_arr = lower_band.to_numpy(dtype=float)
+    
     # Initialize SuperTrend
-    supertrend = pd.Series(index=df.index, dtype=float)
-    direction = pd.Series(index=df.index, dtype=float)
+    st_arr = np.full(len(df), np.nan)
+    dir_arr = np.full(len(df), np.nan)
     
     # First valid value
-    supertrend.iloc[period] = upper_band.iloc[period]
-    direction.iloc[period] = -1
+    st_arr[period] = upper_arr[period]
+    dir_arr[period] = -1
     
     for i in range(period + 1, len(df)):
         # Previous values
-        prev_supertrend = supertrend.iloc[i-1]
-        prev_close = close.iloc[i-1]
-        curr_close = close.iloc[i]
-        prev_direction = direction.iloc[i-1]
+        prev_supertrend = st_arr[i-1]
+        prev_close = close_arr[i-1]
+        curr_close = close_arr[i]
         
-        curr_upper = upper_band.iloc[i]
-        curr_lower = lower_band.iloc[i]
-        prev_upper = upper_band.iloc[i-1]
-        prev_lower = lower_band.iloc[i-1]
+        curr_upper = upper_arr[i]
+        curr_lower = lower_arr[i]
+        prev_upper = upper_arr[i-1]
+        prev_lower = lower_arr[i-1]
         
         # Calculate final bands
         if curr_lower > prev_lower or prev_close < prev_lower:
@@ -132,19 +156,21 @@ def calculate_supertrend(df: pd.DataFrame, period: int = 10, multiplier: float =
         # Determine SuperTrend and direction
         if prev_supertrend == prev_upper:
             if curr_close > final_upper:
-                supertrend.iloc[i] = final_lower
-                direction.iloc[i] = 1  # Bullish
+                st_arr[i] = final_lower
+                dir_arr[i] = 1  # Bullish
             else:
-                supertrend.iloc[i] = final_upper
-                direction.iloc[i] = -1  # Bearish
+                st_arr[i] = final_upper
+                dir_arr[i] = -1  # Bearish
         else:
             if curr_close < final_lower:
-                supertrend.iloc[i] = final_upper
-                direction.iloc[i] = -1  # Bearish
+                st_arr[i] = final_upper
+                dir_arr[i] = -1  # Bearish
             else:
-                supertrend.iloc[i] = final_lower
-                direction.iloc[i] = 1  # Bullish
+                st_arr[i] = final_lower
+                dir_arr[i] = 1  # Bullish
     
+    supertrend = pd.Series(st_arr, index=df.index)
+    direction = pd.Series(dir_arr, index=df.index)
     return supertrend, direction
 
 
@@ -184,15 +210,7 @@ def calculate_pivot_points(df: pd.DataFrame) -> Dict[str, float]:
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> float:
     """Calculate current ATR value."""
-    high = df['high']
-    low = df['low']
-    close = df['close']
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift(1))
-    tr3 = abs(low - close.shift(1))
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
+    atr = true_range(df).rolling(window=period).mean()
     
     return atr.iloc[-1]
 
@@ -220,7 +238,8 @@ def get_volume_ratio(df: pd.DataFrame, period: int = 20) -> float:
 # MAIN STRATEGY
 # =============================================================================
 
-def supertrend_pivot_swing(symbol: str, df: pd.DataFrame) -> SwingSignal:
+def supertrend_pivot_swing(symbol: str, df: pd.DataFrame,
+                           tr: Optional[pd.Series] = None) -> SwingSignal:
     """
     SuperTrend + Pivot Point Swing Trading Strategy
     
@@ -231,6 +250,7 @@ def supertrend_pivot_swing(symbol: str, df: pd.DataFrame) -> SwingSignal:
     Args:
         symbol: Stock symbol
         df: Daily OHLCV DataFrame (minimum 50 rows)
+        tr: Precomputed True Range of df, if the caller already has it
     
     Returns:
         SwingSignal with trade details
@@ -250,14 +270,18 @@ def supertrend_pivot_swing(symbol: str, df: pd.DataFrame) -> SwingSignal:
             reason="Insufficient data"
         )
     
-    # Normalize column names
-    df = df.copy()
-    df.columns = [c.lower() for c in df.columns]
+    # Normalize column names (df is only read, so skip the copy when
+    # they are already lowercase)
+    if any(c != c.lower() for c in df.columns):
+        df = df.rename(columns=str.lower)
     
-    # Calculate indicators
-    supertrend, direction = calculate_supertrend(df, period=10, multiplier=3.0)
+    # Calculate indicators (SuperTrend and ATR share one True Range pass)
+    if tr is None:
+        tr = true_range(df)
+    supertrend, direction = calculate_supertrend(df, period=10, multiplier=3.0, tr=tr)
     pivots = calculate_pivot_points(df)
-    atr = calculate_atr(df, period=14)
+    atr_series = tr.rolling(window=14).mean()
+    atr = atr_series.iloc[-1]
     swing_high, swing_low = get_swing_points(df, lookback=10)
     volume_ratio = get_volume_ratio(df)
     
@@ -398,7 +422,7 @@ def supertrend_pivot_swing(symbol: str, df: pd.DataFrame) -> SwingSignal:
                 reasons.append("Strong trend slope")
             
             # ATR expanding
-            prev_atr = calculate_atr(df.iloc[:-1], period=14)
+            prev_atr = atr_series.iloc[-2]
             if atr > prev_atr * 1.1:
                 confidence += 0.05
                 reasons.append("ATR expanding")
@@ -518,7 +542,8 @@ def supertrend_pivot_swing(symbol: str, df: pd.DataFrame) -> SwingSignal:
 # DISPATCHER
 # =============================================================================
 
-def swing_strategy_dispatcher(symbol: str, df: pd.DataFrame) -> Optional[Dict]:
+def swing_strategy_dispatcher(symbol: str, df: pd.DataFrame,
+                              tr: Optional[pd.Series] = None) -> Optional[Dict]:
     """
     Main dispatcher for swing strategy.
     
@@ -527,11 +552,12 @@ def swing_strategy_dispatcher(symbol: str, df: pd.DataFrame) -> Optional[Dict]:
     Args:
         symbol: Stock symbol
         df: Daily OHLCV DataFrame
+        tr: Precomputed True Range of df (optional)
     
     Returns:
         Signal dict or None
     """
-    signal = supertrend_pivot_swing(symbol, df)
+    signal = supertrend_pivot_swing(symbol, df, tr=tr)
     
     # Return signal if valid (cutoff decreased to 0.5 to allow external filtering)
     if signal.signal != "HOLD" and signal.confidence >= 0.5:
@@ -540,9 +566,10 @@ def swing_strategy_dispatcher(symbol: str, df: pd.DataFrame) -> Optional[Dict]:
     return None
 
 
-def scan_stock(symbol: str, df: pd.DataFrame) -> Optional[Dict]:
+def scan_stock(symbol: str, df: pd.DataFrame,
+               tr: Optional[pd.Series] = None) -> Optional[Dict]:
     """Convenience wrapper for scanning a single stock."""
-    return swing_strategy_dispatcher(symbol, df)
+    return swing_strategy_dispatcher(symbol, df, tr=tr)
 
 
 def get_market_analysis(symbol: str, df: pd.DataFrame) -> Dict:
@@ -554,12 +581,13 @@ def get_market_analysis(symbol: str, df: pd.DataFrame) -> Dict:
     if len(df) < 50:
         return {"error": "Insufficient data"}
     
-    df = df.copy()
-    df.columns = [c.lower() for c in df.columns]
+    if any(c != c.lower() for c in df.columns):
+        df = df.rename(columns=str.lower)
     
-    supertrend, direction = calculate_supertrend(df)
+    tr = true_range(df)
+    supertrend, direction = calculate_supertrend(df, tr=tr)
     pivots = calculate_pivot_points(df)
-    atr = calculate_atr(df)
+    atr = tr.rolling(window=14).mean().iloc[-1]
     swing_high, swing_low = get_swing_points(df)
     volume_ratio = get_volume_ratio(df)
     
@@ -0,0 +1,103 @@
+import os
+from datetime import datetime
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("yfinance")
+
+import ohlcv_cache
+
+
+# A Wednesday, so the weekday rules apply
+TRADING_DAY = datetime(2024, 1, 17)
+
+
+def _cached_file(tmp_path, written_at):
+    path = tmp_path / "TCS_1d.parquet"
+    path.write_bytes(b"")
+    os.utime(path, (written_at.timestamp(), written_at.timestamp()))
+    cached = pd.DataFrame({"close": [100.0]}, index=[pd.Timestamp(TRADING_DAY.date())])
+    return str(path), cached
+
+
+def test_is_fresh_rejects_intraday_bar_read_after_close(tmp_path):
+    path, cached = _cached_file(tmp_path, TRADING_DAY.replace(hour=11))
+    now = TRADING_DAY.replace(hour=16)
+
+    assert not ohlcv_cache.is_fresh(path, cached, now=now)
+
+
+def test_is_fresh_accepts_bar_written_after_close(tmp_path):
+    path, cached = _cached_file(tmp_path, TRADING_DAY.replace(hour=15, minute=45))
+    now = TRADING_DAY.replace(hour=16)
+
+    assert ohlcv_cache.is_fresh(path, cached, now=now)
+
+
+def test_period_start_rejects_periods_yahoo_does_not_accept():
+    with pytest.raises(ValueError):
+        ohlcv_cache.period_start("60d")
+
+
+def test_download_requires_period_or_start():
+    with pytest.raises(ValueError):
+        ohlcv_cache.download({"TCS": "TCS.NS"})
+
+
+def _bars(start, closes):
+    index = pd.date_range(start, periods=len(closes), freq="D")
+    return pd.DataFrame({"close": closes}, index=index)
+
+
+def test_tail_update_does_not_extend_rebuild_deadline(tmp_path):
+    path = str(tmp_path / "TCS_1d.parquet")
+    fetched = datetime(2024, 1, 10, 16)
+
+    ohlcv_cache.store(path, None, _bars("2024-01-08", [100.0, 101.0, 102.0]), now=fetched)
+    cached = ohlcv_cache.load(path, now=fetched.replace(day=15))
+    ohlcv_cache.store(path, cached, _bars("2024-01-10", [102.0, 103.0]),
+                      now=fetched.replace(day=16))
+
+    assert ohlcv_cache.fetched_at(path) == fetched.timestamp()
+    assert ohlcv_cache.load(path, now=fetched.replace(day=18)) is None
+
+
+def test_adjustments_changed_ignores_partial_last_bar():
+    cached = _bars("2024-01-08", [100.0, 101.0, 102.0])
+    new = _bars("2024-01-09", [101.0, 102.5, 104.0])
+
+    assert not ohlcv_cache.adjustments_changed(cached, new)
+
+
+def test_adjustments_changed_detects_readjusted_history():
+    cached = _bars("2024-01-08", [100.0, 101.0, 102.0])
+    new = _bars("2024-01-09", [50.5, 51.0, 52.0])
+
+    assert ohlcv_cache.adjustments_changed(cached, new)
+
+
+def test_is_fresh_rejects_partial_friday_bar_on_weekend(tmp_path):
+    friday = datetime(2024, 1, 19)
+    path, cached = _cached_file(tmp_path, friday.replace(hour=11))
+    cached.index = [pd.Timestamp(friday.date())]
+
+    assert not ohlcv_cache.is_fresh(path, cached, now=datetime(2024, 1, 20, 9))
+
+
+def test_is_fresh_accepts_final_friday_bar_on_weekend(tmp_path):
+    friday = datetime(2024, 1, 19)
+    path, cached = _cached_file(tmp_path, friday.replace(hour=16))
+    cached.index = [pd.Timestamp(friday.date())]
+
+    assert ohlcv_cache.is_fresh(path, cached, now=datetime(2024, 1, 21, 20))
+
+
+def test_write_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "TCS_1d.parquet")
+
+    ohlcv_cache.write(path, _bars("2024-01-08", [100.0, 101.0]), 0.0)
+    ohlcv_cache.write(path, _bars("2024-01-08", [100.0, 101.0, 102.0]), 0.0)
+
+    assert os.listdir(tmp_path) == ["TCS_1d.parquet"]
+    assert len(pd.read_parquet(path)) == 3
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from strategies.rsi_divergence import RSIDivergenceStrategy
+
+
+def _ohlcv(n=400, seed=0):
+    """Random-walk 15m bars with enough swings to produce divergences."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n)),
+        "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n)),
+        "close": close,
+        "volume": rng.integers(1000, 5000, n).astype(float),
+    }, index=pd.date_range("2024-01-01", periods=n, freq="15min"))
+
+
+def test_check_signals_finds_divergences():
+    df = _ohlcv()
+    signals = RSIDivergenceStrategy().check_signals(df)
+
+    assert signals
+    for s in signals:
+        if s["action"] == "BUY":
+            assert s["sl"] < s["price"] < s["tp"]
+        else:
+            assert s["tp"] < s["price"] < s["sl"]
+        assert s["time"] in df.index
+
+
+def test_check_signals_leaves_caller_frame_untouched():
+    df = _ohlcv()
+    before = df.copy()
+
+    RSIDivergenceStrategy().check_signals(df)
+
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_check_signals_needs_60_bars():
+    assert RSIDivergenceStrategy().check_signals(_ohlcv(n=59)) == []
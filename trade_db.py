@@ -39,6 +39,16 @@ def init_db():
         )
     ''')
     
+    # Wallet replay and analytics filter/group trades by strategy and status
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS idx_trades_strategy_status ON trades (strategy, status)
+    ''')
+
+    # Open-position checks and the monitor loop only read OPEN rows
+    c.execute('''
+        CREATE INDEX IF NOT EXISTS ix_trades_open ON trades (symbol) WHERE status = 'OPEN'
+    ''')
+    
     conn.commit()
     conn.close()
     print("✅ Database initialized (WAL Mode Enabled).")
@@ -47,6 +57,8 @@ def get_connection():
     # Helper to get connection with proper timeout
     conn = sqlite3.connect(DB_NAME, timeout=10)
     conn.execute("PRAGMA journal_mode=WAL;") 
+    # Safe with WAL: only a power loss can drop the last commits
+    conn.execute("PRAGMA synchronous=NORMAL;")
     return conn
 
 def ensure_wallet_exists(strategy):
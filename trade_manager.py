@@ -3,6 +3,7 @@ import pandas as pd
 import yfinance as yf
 from trade_db import get_connection, log_trade, get_balance, close_trade_in_db
 from alerts import AlertBot # Reuse for Telegram
+from ohlcv_cache import split_batch
 
 # Configuration
 CAPITAL_STOCK = 100000.0  # Old Swing Strategy
@@ -32,9 +33,15 @@ def get_open_trades(instrument_type=None):
             
     return df
 
-def execute_trade(signal):
+def execute_trade(signal, open_trades=None):
     """
     Execute a trade based on signal.
+
+    Pass open_trades (from get_open_trades('STOCK')) when executing a batch
+    of signals to avoid re-reading the trades table for each one.
+
+    Returns True if a trade was logged, False if the signal was skipped
+    (slot limit, duplicate symbol, insufficient funds or zero quantity).
     """
     symbol = signal['symbol']
     price = signal['price']
@@ -53,7 +60,8 @@ def execute_trade(signal):
 
     # Get Open Trades
     # We execute mostly STOCK trades here.
-    open_trades = get_open_trades('STOCK')
+    if open_trades is None:
+        open_trades = get_open_trades('STOCK')
     
     # Filter for Specific Strategy Count
     if not open_trades.empty:
@@ -68,12 +76,12 @@ def execute_trade(signal):
         # 1. Check Max Limit
         if current_count >= max_slots:
             print(f"⚠️ Limit Reached for {strategy}: {current_count}/{max_slots} slots full.")
-            return
+            return False
 
         # 2. Check Duplicate Symbol (Global check, don't buy same stock twice across strategies ideally)
         if symbol in open_trades['symbol'].values:
             print(f"⚠️ Skipping {symbol}: already open position.")
-            return
+            return False
     else:
         current_count = 0
 
@@ -81,14 +89,14 @@ def execute_trade(signal):
     balance = get_balance()
     if balance < allocation_per_trade:
         print(f"❌ Insufficient funds ({balance}) for new trade.")
-        return
+        return False
 
     # 4. Calculate Quantity
     qty = int(allocation_per_trade // price)
     
     if qty == 0:
         print(f"❌ Price {price} too high for allocation {allocation_per_trade}")
-        return
+        return False
 
     # 5. Log Trade (Paper Trade)
     log_trade(
@@ -105,6 +113,7 @@ def execute_trade(signal):
     smart_tag = " [SMART]" if strategy == 'SWING_SMART' else ""
     msg = f"🆕 <b>TRADE EXECUTED{smart_tag}</b>\n\n🟢 BUY {symbol}\nQty: {qty}\nPrice: {price}\nSL: {sl}\nTP: {tp}"
     alert_bot.send_message(msg)
+    return True
 
 
 def monitor_positions():
@@ -135,33 +144,45 @@ def monitor_positions():
 
     print(f"🔍 Monitoring {len(trades)} open positions...")
     
+    # Fetch intraday bars for every open symbol in one request
+    tickers = [f"{symbol}.NS" for symbol in trades['symbol'].unique()]
+    try:
+        bulk = yf.download(tickers, period="1d", interval="15m", group_by="ticker",
+                           threads=True, progress=False)
+        prices = split_batch(bulk, tickers)
+    except Exception as e:
+        print(f"Price fetch failed: {e}")
+        prices = {}
+    
     total_unrealized_pnl = 0.0
     
-    for index, row in trades.iterrows():
-        symbol = row['symbol']
-        trade_id = row['id']
-        strategy = row.get('strategy', 'SWING') # Default to old
+    # Parse entry times for all positions at once; itertuples yields plain
+    # tuples instead of boxing every row into a Series
+    trades = trades.assign(entry_time=pd.to_datetime(trades['entry_time']))
+    
+    for row in trades.itertuples(index=False):
+        symbol = row.symbol
+        trade_id = row.id
+        strategy = getattr(row, 'strategy', 'SWING') # Default to old
         
-        sl = row['sl']
-        tp = row['tp']
-        signal_type = row['signal_type'] # BUY
-        entry_price = row['entry_price']
-        entry_date = pd.to_datetime(row['entry_time'])
+        sl = row.sl
+        tp = row.tp
+        signal_type = row.signal_type # BUY
+        entry_price = row.entry_price
+        entry_date = row.entry_time
         
         # Fetch current price
         try:
-            ticker = f"{symbol}.NS"
-            data = yf.download(ticker, period="1d", interval="15m", progress=False)
+            data = prices.get(f"{symbol}.NS")
             
             if data is None or data.empty: 
                 print(f"No data for {symbol}")
                 continue
                 
-            close_data = data['Close'].iloc[-1]
-            current_price = float(close_data.item()) if hasattr(close_data, 'item') else float(close_data)
+            current_price = float(data['close'].iloc[-1])
             
             # Calculate Unrealized PnL for this trade
-            qty = row['quantity']
+            qty = row.quantity
             # Assuming BUY triggers
             trade_pnl = (current_price - entry_price) * qty
             total_unrealized_pnl += trade_pnl